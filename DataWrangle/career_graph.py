@@ -0,0 +1,170 @@
+import re
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+
+class Edge(NamedTuple):
+    target: str
+    wage_change: float
+    direction: int
+
+
+def normalize_title(title):
+    return re.sub(r'\s+', ' ', str(title).casefold()).strip()
+
+
+def trigrams(text):
+    """Character trigrams of an already normalized string"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class CareerGraph:
+    """Dashboard transitions compiled into an adjacency list keyed by SOC code"""
+
+    def __init__(self):
+        self.titles = {}                     # soc -> title
+        self.edges = defaultdict(dict)       # soc -> {target soc: best Edge}
+        self.reverse = defaultdict(dict)     # target soc -> {soc: best Edge}
+        self.rows = {}                       # soc -> positional rows in the source frame
+        self._title_codes = defaultdict(list)
+        self._trigram_index = defaultdict(set)
+
+    @classmethod
+    def from_transitions(cls, df):
+        graph = cls()
+
+        codes = df['SOCCode'].astype(str).to_numpy()
+        targets = df['TransitionSOCCode'].astype(str).to_numpy()
+        wage_changes = df['TransitionWageChange'].to_numpy(dtype=float)
+        directions = df['TransitionWageDirection'].fillna(0).to_numpy(dtype=int)
+
+        for code, title in zip(codes, df['SOCTitle']):
+            graph.titles.setdefault(code, title)
+        for code, title in zip(targets, df['TransitionSOCTitle']):
+            graph.titles.setdefault(code, title)
+
+        for code, target, wage_change, direction in zip(codes, targets, wage_changes, directions):
+            if np.isnan(wage_change):
+                continue
+            # duplicate rows for a pair keep the best wage change
+            current = graph.edges[code].get(target)
+            if current is None or wage_change > current.wage_change:
+                graph.edges[code][target] = Edge(target, float(wage_change), int(direction))
+                graph.reverse[target][code] = Edge(code, float(wage_change), int(direction))
+
+        order = np.argsort(codes, kind='stable')
+        unique_codes, starts = np.unique(codes[order], return_index=True)
+        for code, rows in zip(unique_codes, np.split(order, starts[1:])):
+            graph.rows[code] = rows
+
+        for code, title in graph.titles.items():
+            normalized = normalize_title(title)
+            graph._title_codes[normalized].append(code)
+            for gram in trigrams(f'  {normalized} '):
+                graph._trigram_index[gram].add(normalized)
+
+        return graph
+
+    def resolve(self, title, limit=None, fuzzy=True, min_score=0.3) -> List[str]:
+        """SOC codes for a free-text title
+
+        Exact title first, then every title containing the query (what
+        str.contains used to give), then the closest titles by trigram overlap.
+        """
+        query = normalize_title(title)
+        if not query:
+            return []
+        if query in self._title_codes:
+            return list(self._title_codes[query])
+
+        # a title contains the query only if it has all of the query's trigrams
+        grams = trigrams(query)
+        if grams:
+            postings = sorted((self._trigram_index.get(g, set()) for g in grams), key=len)
+            candidates = set.intersection(*postings) if postings[0] else set()
+        else:
+            candidates = self._title_codes.keys()
+        contained = sorted(t for t in candidates if query in t)
+        if contained:
+            codes = [code for t in contained for code in self._title_codes[t]]
+            return codes[:limit] if limit else codes
+
+        if not fuzzy:
+            return []
+
+        padded = trigrams(f'  {query} ')
+        shared = defaultdict(int)
+        for gram in padded:
+            for t in self._trigram_index.get(gram, ()):
+                shared[t] += 1
+        scored = []
+        for t, count in shared.items():
+            score = count / (len(padded) + len(trigrams(f'  {t} ')) - count)
+            if score >= min_score:
+                scored.append((score, t))
+        scored.sort(reverse=True)
+        codes = [code for _, t in scored for code in self._title_codes[t]]
+        return codes[:limit or 5]
+
+    def transition_rows(self, codes) -> np.ndarray:
+        """Source-frame rows for transitions leaving any of `codes`"""
+        parts = [self.rows[code] for code in codes if code in self.rows]
+        return np.concatenate(parts) if parts else np.array([], dtype=np.intp)
+
+    def next_hops(self, code, direction=None, limit=None) -> List[Edge]:
+        """Outgoing transitions, best wage change first"""
+        hops = [
+            edge for edge in self.edges.get(code, {}).values()
+            if direction is None or edge.direction == direction
+        ]
+        hops.sort(key=lambda edge: edge.wage_change, reverse=True)
+        return hops[:limit] if limit else hops
+
+    def best_path(self, source, target, max_hops=3) -> Optional[Dict]:
+        """Highest total wage change path of at most `max_hops` transitions
+
+        Hop-bounded DP: layer k keeps only the best path reaching each node in
+        exactly k hops, so the search costs O(max_hops * edges) instead of
+        walking every simple path.
+        """
+        if source == target or source not in self.edges:
+            return None
+        best_gain, best_path = None, None
+        frontier = {source: (0.0, (source,))}
+
+        for hop in range(1, max_hops + 1):
+            layer = {}
+            for code, (gain, path) in frontier.items():
+                for nxt, edge in self.edges.get(code, {}).items():
+                    if nxt in path:
+                        continue
+                    total = gain + edge.wage_change
+                    if nxt == target:
+                        # strict > keeps the shorter path on ties
+                        if best_gain is None or total > best_gain:
+                            best_gain, best_path = total, path + (target,)
+                    elif hop < max_hops:
+                        current = layer.get(nxt)
+                        if current is None or total > current[0]:
+                            layer[nxt] = (total, path + (nxt,))
+            frontier = layer
+
+        if best_path is None:
+            return None
+        return {
+            'wage_change': best_gain,
+            'path': list(best_path),
+            'titles': [self.titles.get(code, code) for code in best_path]
+        }
+
+    def best_path_by_title(self, from_title, to_title, max_hops=3, candidates=3) -> Optional[Dict]:
+        """best_path between the closest SOC matches for two free-text titles"""
+        best = None
+        for source in self.resolve(from_title, limit=candidates):
+            for target in self.resolve(to_title, limit=candidates):
+                path = self.best_path(source, target, max_hops)
+                if path and (best is None or path['wage_change'] > best['wage_change']):
+                    best = path
+        return best
@@ -0,0 +1,135 @@
+import os
+import re
+import sys
+import json
+import glob
+import hashlib
+import inspect
+import logging
+
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # cache is optional, wrangling still works without it
+    pa = None
+    feather = None
+
+
+logger = logging.getLogger(__name__)
+
+# bump to invalidate every cached frame (e.g. after changing read options)
+WRANGLE_VERSION = "3"
+
+
+def default_cache_dir(data_folder):
+    return os.path.join(data_folder, '.cache')
+
+
+def file_digest(path, manifest=None):
+    """sha256 of a file, reused from the manifest while size and mtime are unchanged"""
+    stat = os.stat(path)
+    stamp = [stat.st_size, stat.st_mtime_ns]
+    entry = (manifest or {}).get(os.path.abspath(path))
+    if entry and entry['stamp'] == stamp:
+        return entry['sha256']
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    if manifest is not None:
+        manifest[os.path.abspath(path)] = {'stamp': stamp, 'sha256': digest.hexdigest()}
+    return digest.hexdigest()
+
+
+def _source(func):
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        return getattr(func, '__qualname__', repr(func))
+
+
+def code_digest(func):
+    """sha256 of a function's source plus the DataWrangle helpers and constants it uses
+
+    So editing e.g. parse_salary_range also invalidates wrangle_job_data.
+    """
+    package = __name__.rpartition('.')[0]
+    digest = hashlib.sha256()
+    seen = set()
+    pending = [func]
+    while pending:
+        current = pending.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        digest.update(_source(current).encode('utf-8'))
+
+        code = getattr(current, '__code__', None)
+        if code is None:
+            continue
+        names = set(code.co_names)
+        for const in code.co_consts:
+            # names used inside nested lambdas/comprehensions
+            if inspect.iscode(const):
+                names.update(const.co_names)
+        for name in sorted(names):
+            value = current.__globals__.get(name)
+            if inspect.isfunction(value) and value.__module__.startswith(package):
+                pending.append(value)
+            elif isinstance(value, re.Pattern):
+                digest.update(f'{name}={value.pattern}/{value.flags}'.encode('utf-8'))
+            elif isinstance(value, (dict, list, tuple, str, int, float)):
+                digest.update(f'{name}={value!r}'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_manifest(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, 'manifest.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(cache_dir, manifest):
+    path = os.path.join(cache_dir, 'manifest.json')
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp, path)
+
+
+def write_frame(df, path):
+    """Uncompressed Arrow IPC, so readers can mmap it straight from the page cache"""
+    tmp = f'{path}.{os.getpid()}.tmp'
+    feather.write_feather(df, tmp, compression='uncompressed')
+    os.replace(tmp, path)
+
+
+def read_frame(path):
+    table = feather.read_table(path, memory_map=True)
+    df = table.to_pandas(split_blocks=True)
+    # Arrow hands list columns back as numpy arrays
+    for field in table.schema:
+        if pa.types.is_list(field.type) or pa.types.is_large_list(field.type):
+            df[field.name] = df[field.name].map(lambda v: list(v) if v is not None else v)
+    return df
+
+
+def main():
+    """python -m DataWrangle.dataset_cache [data_folder]"""
+    from .wrangling import JobSkillsAnalyzer
+
+    logging.basicConfig(level=logging.INFO)
+    data_folder = sys.argv[1] if len(sys.argv) > 1 else 'Datasets'
+    if feather is None:
+        sys.exit("pyarrow is required to build the dataset cache")
+    analyzer = JobSkillsAnalyzer(data_folder).load_data()
+    print(f"Resident frames (MB): {analyzer.memory_usage()}")
+    print(f"Dataset cache written to {default_cache_dir(data_folder)}")
+
+
+if __name__ == "__main__":
+    main()
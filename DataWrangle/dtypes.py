@@ -0,0 +1,135 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+# repeated strings -> category, flags/direction codes -> int8, wages -> float32
+DTYPE_PLANS = {
+    'jobs': {
+        'Job Title': 'category',
+        'Company': 'category',
+        'Location': 'category',
+        'Experience Level': 'category',
+        'Experience_Level': 'int8',
+        'Salary_Min': 'float32',
+        'Salary_Max': 'float32',
+        'Salary_Avg': 'float32',
+    },
+    'skills': {
+        'Career': 'category',
+    },
+    'transitions': {
+        'SOCCode': 'category',
+        'SOCTitle': 'category',
+        'TransitionSOCCode': 'category',
+        'TransitionSOCTitle': 'category',
+        'TransitionDirection': 'category',
+        'Transition_Type': 'category',
+        'TransitionWageDirection': 'int8',
+        'TransitionWageChange': 'float32',
+        'WageChangePercent': 'float32',
+        'Wage_Change_Pct': 'float32',
+    },
+    'trajectories': {
+        'woman': 'int8',
+        're_hispanic': 'int8',
+        're_blackNH': 'int8',
+        're_whiteNH': 'int8',
+        're_otherNH': 'int8',
+        'educBA_0': 'int8',
+        'educBA_119': 'int8',
+        'educAA_0': 'int8',
+        'educAA_119': 'int8',
+        'education_improved': 'int8',
+        'startingsector': 'category',
+        'wage_0cap': 'float32',
+        'wage_119cap': 'float32',
+        'abswagech10': 'float32',
+        'wage_change': 'float32',
+        'wage_change_pct': 'float32',
+        'Career_Stability': 'float32',
+    },
+    'employment': {
+        'raceeth_whiteNH': 'int8',
+        'raceeth_blackNH': 'int8',
+        'raceeth_Hispanic': 'int8',
+        'TransitionSuccess': 'int8',
+        'sector_transition': 'int8',
+        'zone_transition': 'int8',
+        'sector_SRCE': 'category',
+        'sector_DEST': 'category',
+        'wage_SRCE': 'float32',
+        'wage_DEST': 'float32',
+        'medhrlywage_SRCE': 'float32',
+        'medhrlywage_DEST': 'float32',
+    },
+    'geo': {
+        'FIPSCode': 'category',
+        'City': 'category',
+        'State': 'category',
+        'Latitude': 'float32',
+        'Longitude': 'float32',
+    },
+}
+
+
+def frame_memory(df):
+    """Deep memory usage of a frame in bytes"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _cast(series, dtype):
+    if dtype == 'int8':
+        values = pd.to_numeric(series, errors='coerce')
+        # int8 has no NaN, gaps stay float32 rather than becoming 0
+        if values.isna().any() or not values.between(-128, 127).all():
+            return values.astype('float32')
+        if not np.array_equal(values, values.round()):
+            return values.astype('float32')
+        return values.astype('int8')
+    if dtype == 'float32':
+        return pd.to_numeric(series, errors='coerce').astype('float32')
+    return series.astype(dtype)
+
+
+def apply_dtype_plan(df, name, plan=None):
+    """Cast the columns in DTYPE_PLANS[name] that the frame has, logging memory saved"""
+    plan = DTYPE_PLANS.get(name, {}) if plan is None else plan
+    # only runs when a stage is (re)built, cached frames skip it
+    before = frame_memory(df)
+    for column, dtype in plan.items():
+        if column in df.columns and df[column].dtype != dtype:
+            df[column] = _cast(df[column], dtype)
+    logger.info(f"{name}: {before / 1e6:.1f} MB -> {frame_memory(df) / 1e6:.1f} MB")
+    return df
+
+
+def _wide_memory(series):
+    """Bytes a planned column would take as read_csv leaves it (strings/int64/float64)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # one column at a time, so the expanded copy is short-lived
+        expanded = series.astype(series.cat.categories.dtype)
+        return int(expanded.memory_usage(deep=True, index=False))
+    return 8 * len(series)
+
+
+def memory_report(frames):
+    """{name: {'before_mb', 'after_mb'}} for a dict of frames named like DTYPE_PLANS
+
+    'after' is what the frame takes now; 'before' is the same frame with its
+    planned columns at read_csv's dtypes, worked out from the column data,
+    so it's available for frames loaded from the cache too.
+    """
+    report = {}
+    for name, df in frames.items():
+        after = frame_memory(df)
+        planned = [column for column in DTYPE_PLANS.get(name, {}) if column in df.columns]
+        before = after
+        if planned:
+            before += sum(_wide_memory(df[column]) for column in planned)
+            before -= int(df[planned].memory_usage(deep=True, index=False).sum())
+        report[name] = {'before_mb': round(before / 1e6, 2), 'after_mb': round(after / 1e6, 2)}
+    return report
@@ -0,0 +1,148 @@
+import os
+import glob
+import time
+import hashlib
+import logging
+from typing import Callable, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from . import dataset_cache
+
+
+logger = logging.getLogger(__name__)
+
+
+class Stage(NamedTuple):
+    """One step of a dataset's wrangling
+
+    A stage either reads `source` (a file in the data folder) and hands the
+    parsed frame to `func`, or calls `func` with the frames of `inputs`.
+    `reader` parses the source (default read_csv), e.g. one of the chunked
+    readers in streaming.py for the big CSVs. Bump `version` to force a
+    rerun for changes the code digest can't see (e.g. a pandas upgrade).
+    """
+    name: str
+    func: Callable
+    source: Optional[str] = None
+    inputs: Tuple[str, ...] = ()
+    version: str = "1"
+    reader: Optional[Callable] = None
+
+
+def read_csv(path):
+    return pd.read_csv(path)
+
+
+def _hash(*parts):
+    return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+class Pipeline:
+    """Declared stages, each memoized on disk by input hash + stage version
+
+    A stage's key covers its code (and helpers), version and the keys of
+    everything upstream, so refreshing one CSV or editing one wrangle
+    function only reruns that dataset's stages. Parsed CSVs are cached as
+    their own `<name>.raw` stage, so a code change skips the parse too.
+    """
+
+    def __init__(self, data_folder, stages, cache_dir=None, use_cache=True):
+        self.data_folder = data_folder
+        self.cache_dir = cache_dir or dataset_cache.default_cache_dir(data_folder)
+        self.use_cache = use_cache and dataset_cache.feather is not None
+        self.stages = {}
+        self.outputs = [stage.name for stage in stages]
+        for stage in stages:
+            if stage.source:
+                raw = f'{stage.name}.raw'
+                self.stages[raw] = Stage(raw, stage.reader or read_csv, source=stage.source)
+                stage = stage._replace(source=None, inputs=(raw,) + tuple(stage.inputs))
+            self.stages[stage.name] = stage
+        self._frames = {}   # name -> (key, frame), for this process
+        self._keys = {}
+        self._manifest = None
+
+    def key(self, name):
+        """Cache key of a stage; changes whenever it or anything upstream does"""
+        if name in self._keys:
+            return self._keys[name]
+        stage = self.stages[name]
+        if stage.source:
+            path = os.path.join(self.data_folder, stage.source)
+            upstream = [dataset_cache.file_digest(path, self._load_manifest())]
+        else:
+            upstream = [self.key(dep) for dep in stage.inputs]
+        # code_digest follows helpers too, e.g. apply_dtype_plan -> DTYPE_PLANS
+        key = _hash(
+            dataset_cache.WRANGLE_VERSION, stage.version,
+            dataset_cache.code_digest(stage.func), *upstream
+        )
+        self._keys[name] = key
+        return key
+
+    def get(self, name, keep=True):
+        """Frame for a stage, from memory, disk, or by running it
+
+        keep=False skips the in-process memo, used for upstream frames so raw
+        parses don't stay resident next to the wrangled ones.
+        """
+        key = self.key(name)
+        cached = self._frames.get(name)
+        if cached and cached[0] == key:
+            return cached[1]
+
+        path = os.path.join(self.cache_dir, f'{name}-{key[:16]}.feather')
+        df = self._read(path) if self.use_cache else None
+        if df is None:
+            df = self._run(name)
+            if self.use_cache:
+                self._write(name, df, path)
+        if keep:
+            self._frames[name] = (key, df)
+        return df
+
+    def _run(self, name):
+        stage = self.stages[name]
+        start = time.perf_counter()
+        if stage.source:
+            df = stage.func(os.path.join(self.data_folder, stage.source))
+        else:
+            # upstream frames are handed over, not kept, so stages may mutate them
+            df = stage.func(*[self.get(dep, keep=False) for dep in stage.inputs])
+        logger.info(f"Stage {name} ran in {time.perf_counter() - start:.2f}s")
+        return df.reset_index(drop=True)
+
+    def _read(self, path):
+        if not os.path.exists(path):
+            return None
+        try:
+            return dataset_cache.read_frame(path)
+        except Exception as e:
+            logger.warning(f"Unreadable cache {path}, rebuilding: {e}")
+            return None
+
+    def _write(self, name, df, path):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            dataset_cache.write_frame(df, path)
+            for stale in glob.glob(os.path.join(self.cache_dir, f'{glob.escape(name)}-*.feather')):
+                if stale != path:
+                    os.remove(stale)
+            dataset_cache.save_manifest(self.cache_dir, self._load_manifest())
+        except Exception as e:
+            logger.warning(f"Could not cache {name}: {e}")
+
+    def _load_manifest(self):
+        if self._manifest is None:
+            self._manifest = dataset_cache.load_manifest(self.cache_dir)
+        return self._manifest
+
+    def invalidate(self):
+        """Forget in-process keys, e.g. after a dataset file was replaced"""
+        self._keys.clear()
+        self._manifest = None
+
+    def build(self, names=None):
+        """Run (or load) every declared stage, or just `names`"""
+        return {name: self.get(name) for name in (names or self.outputs)}
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# narrow dtypes at parse time, so a chunk never materializes as int64/float64/object
+TRANSITIONS_DTYPES = {
+    'SOCCode': 'category',
+    'SOCTitle': 'category',
+    'TransitionSOCCode': 'category',
+    'TransitionSOCTitle': 'category',
+    'TransitionWageChange': 'float32',
+    'TransitionWageDirection': 'float32',
+}
+
+TRAJECTORIES_DTYPES = {
+    'woman': 'float32',
+    're_hispanic': 'float32',
+    're_blackNH': 'float32',
+    're_whiteNH': 'float32',
+    're_otherNH': 'float32',
+    'wage_0cap': 'float32',
+    'wage_119cap': 'float32',
+    'educBA_0': 'float32',
+    'educBA_119': 'float32',
+    'educAA_0': 'float32',
+    'educAA_119': 'float32',
+    'totjobcount': 'float32',
+    'totmosUnemp10cap': 'float32',
+    'startingsector': 'category',
+}
+
+# wage columns are coerced by wrangle_cps_sipp, so they are left to the parser
+CPS_SIPP_DTYPES = {
+    'raceeth_whiteNH': 'float32',
+    'raceeth_blackNH': 'float32',
+    'raceeth_Hispanic': 'float32',
+    'jobzone_SRCE': 'float32',
+    'jobzone_DEST': 'float32',
+    'sector_SRCE': 'category',
+    'sector_DEST': 'category',
+}
+
+
+def _count_lines(path):
+    """Upper bound on a CSV's data rows (quoted newlines only make it larger)"""
+    count = 1  # an unterminated last line
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            count += block.count(b'\n')
+    return count
+
+
+class _ColumnBuilder:
+    """One column of read_chunked's frame, filled chunk by chunk
+
+    Numeric columns are written straight into a buffer sized for the whole
+    file. Categoricals, strings and columns whose inferred dtype drifts
+    between chunks keep per-column pieces instead, concatenated one column
+    at a time in finish().
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.buffer = None
+        self.pieces = []
+
+    def add(self, start, values):
+        if self.buffer is not None:
+            if values.dtype == self.buffer.dtype:
+                self.buffer[start:start + len(values)] = values.to_numpy()
+                return
+            # e.g. int64 then float64 once a chunk has a NaN: let concat reconcile them
+            self.pieces.append(pd.Series(self.buffer[:start].copy()))
+            self.buffer = None
+        if not self.pieces and isinstance(values.dtype, np.dtype) and values.dtype.kind in 'biuf':
+            self.buffer = np.empty(self.capacity, dtype=values.dtype)
+            self.buffer[:len(values)] = values.to_numpy()
+        else:
+            # a copy, so the chunk's 2D blocks are freed once the chunk is done
+            self.pieces.append(values.copy())
+
+    def finish(self, rows):
+        if self.buffer is not None:
+            return self.buffer[:rows]
+        pieces, self.pieces = self.pieces, []
+        if isinstance(pieces[0].dtype, pd.CategoricalDtype):
+            # chunks see different categories
+            return pd.Series(union_categoricals(pieces))
+        return pd.concat(pieces, ignore_index=True)
+
+
+def read_chunked(path, dtype=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Whole CSV, parsed chunk by chunk straight into narrow dtypes
+
+    Each chunk is copied into its columns as it's read and then dropped, so
+    peak memory stays near the final frame's size rather than the chunks
+    plus their concatenation.
+    """
+    capacity = _count_lines(path)
+    columns = {}
+    rows = 0
+    for chunk in pd.read_csv(path, dtype=dtype, chunksize=chunksize):
+        for name, values in chunk.items():
+            if name not in columns:
+                columns[name] = _ColumnBuilder(capacity)
+            columns[name].add(rows, values)
+        rows += len(chunk)
+    if not columns:
+        return pd.DataFrame()
+    return pd.DataFrame({name: column.finish(rows) for name, column in columns.items()}, copy=False)
+
+
+# raw-load readers for the pipeline's big sources (see wrangling.STAGES)
+def read_transitions(path):
+    return read_chunked(path, TRANSITIONS_DTYPES)
+
+
+def read_trajectories(path):
+    return read_chunked(path, TRAJECTORIES_DTYPES)
+
+
+def read_cps_sipp(path):
+    return read_chunked(path, CPS_SIPP_DTYPES)
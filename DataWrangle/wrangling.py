@@ -1,7 +1,24 @@
+import os
 import pandas as pd
 import numpy as np
 import re
+import logging
 from sklearn.preprocessing import MultiLabelBinarizer, LabelEncoder
+try:
+    from .career_graph import CareerGraph
+    from .pipeline import Pipeline, Stage
+    from .dtypes import apply_dtype_plan, memory_report
+    from .streaming import read_transitions, read_trajectories, read_cps_sipp
+except ImportError:
+    # run as a script (python DataWrangle/wrangling.py): import through the package
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from DataWrangle.career_graph import CareerGraph
+    from DataWrangle.pipeline import Pipeline, Stage
+    from DataWrangle.dtypes import apply_dtype_plan, memory_report
+    from DataWrangle.streaming import read_transitions, read_trajectories, read_cps_sipp
+
+logger = logging.getLogger(__name__)
 
 # GeoData
 def wrangle_geodata(df):
@@ -16,59 +33,75 @@ def wrangle_geodata(df):
     df['ZipCodePlus4'] = df['ZipCodePlus4'].str.replace(r'\D', '', regex=True)
     df = df.drop_duplicates(subset=['ZipCodePlus4'], keep='first')
     
-    return df
+    return apply_dtype_plan(df, 'geo')
 
 #Skills
+# every alias in one compiled pattern, the group that matched picks the replacement
+SKILL_ALIAS_RE = re.compile(r'\b(?:(?P<ml>ML|AI|A\.I)|(?P<dl>DL|Deep\s?L))\b', re.I)
+SKILL_ALIASES = {'ml': 'Machine Learning', 'dl': 'Deep Learning'}
+SKILL_SPLIT_RE = re.compile(r',\s*')
+
+
+def normalize_skill_list(text):
+    """'ML, DL, SQL' -> ['Machine Learning', 'Deep Learning', 'SQL']"""
+    if not isinstance(text, str):
+        return text
+    text = SKILL_ALIAS_RE.sub(lambda m: SKILL_ALIASES[m.lastgroup], text)
+    return SKILL_SPLIT_RE.split(text)
+
+
 def wrangle_skill_data(df):
     """Clean skills mapping data from data.csv"""
     
-    # make it ml
-    skill_clean = df['Skill'].str.replace(
-        r'\b(ML|AI|Ml|A\.I)\b', 'Machine Learning', flags=re.I
-    )
-
-    # deep learning/neural netorks
-    df['Skill'] = skill_clean.str.replace(
-        r'\b(DL|Deep\s?L)\b', 'Deep Learning', flags=re.I
-    )
-    
-    # SKill
-    df['Skill'] = df['Skill'].str.split(r',\s*')
-    
-    # Data
+    # Data first, so only kept rows get normalized
     valid_careers = ['Data Science', 'Software Development', 'AI', 'Cybersecurity']
-    df = df[df['Career'].isin(valid_careers)]
+    df = df[df['Career'].isin(valid_careers)].copy()
     
-    return df
+    # aliases + split in one sweep per row
+    df['Skill'] = df['Skill'].map(normalize_skill_list)
+    
+    return apply_dtype_plan(df, 'skills')
+
+
+CURRENCY_TO_USD = {'$': 1.0, '£': 1.27, '€': 1.08}
 
+# "£58,000 - £78,000", "$90k-120k", "£45,000": currency, low, optional high
+SALARY_RANGE_RE = re.compile(
+    r'(?P<currency>[$£€])?\s*(?P<low>\d[\d,]*(?:\.\d+)?)\s*(?P<low_k>[kK])?'
+    r'(?:\s*(?:-|–|to)\s*[$£€]?\s*(?P<high>\d[\d,]*(?:\.\d+)?)\s*(?P<high_k>[kK])?)?'
+)
 
-def change_salary_range_to_usd(df):
-    # pounds
-    df[['Lower Bound', 'Upper Bound']] = df['Salary Range'].str.replace(r'[$,]', '', regex=True).str.split(' - ', expand=True)
-    df['Lower Bound'] = pd.to_numeric(df['Lower Bound'])
-    df['Upper Bound'] = pd.to_numeric(df['Upper Bound'])
-    df['Lower Bound'] *= 1.5
-    df['Upper Bound'] *= 1.5
 
-    # Test
-    df['Salary Range'] = df['Lower Bound'].astype(int).map('${:,.0f}'.format) + ' - ' + df['Upper Bound'].astype(int).map('${:,.0f}'.format)
+def parse_salary_range(series):
+    """Salary Range strings -> numeric USD Salary_Min/Salary_Max/Salary_Avg in one regex pass"""
+    parts = series.astype('string').str.extract(SALARY_RANGE_RE)
+    rate = parts['currency'].map(CURRENCY_TO_USD).fillna(1.0).astype(float)
 
-    return df
+    def amount(digits, k):
+        value = pd.to_numeric(digits.str.replace(',', '', regex=False), errors='coerce').astype(float)
+        return value.where(k.isna(), value * 1000)
+
+    low = amount(parts['low'], parts['low_k']) * rate
+    high = amount(parts['high'], parts['high_k']).fillna(amount(parts['low'], parts['low_k'])) * rate
+    return pd.DataFrame({
+        'Salary_Min': low,
+        'Salary_Max': high,
+        'Salary_Avg': (low + high) / 2
+    }, index=series.index)
 
 # Data Processing
 def wrangle_job_data(df):
     """job_data.csv"""
     
-    GBP_TO_USD = 1.27
-    
-    # british
-    df['Salary Range'] = df['Salary Range'].str.replace(r'[£]', '$', regex=True)
-    df = change_salary_range_to_usd(df)
-    df['Salary_Min'] = df['Salary Range'].str.extract(r'£(\d+),\d+').astype(float) * GBP_TO_USD * 2
-    df['Salary_Max'] = df['Salary Range'].str.extract(r'£\d+,\d+ - £(\d+),\d+').astype(float) * GBP_TO_USD * 2
-    df['Salary_Avg'] = (df['Salary_Min'] + df['Salary_Max']) / 2
-    
+    # £/$ ranges -> numeric USD, the raw Salary Range is left as is
+    df[['Salary_Min', 'Salary_Max', 'Salary_Avg']] = parse_salary_range(df['Salary Range'])
     
+    # "new york,  ny" -> "New York, NY": title case, state codes stay upper
+    df['Location'] = (
+        df['Location'].str.replace(r'\s+', ' ', regex=True).str.strip().str.title()
+        .str.replace(r'(,\s*)([A-Za-z]{2})$', lambda m: m.group(1) + m.group(2).upper(), regex=True)
+    )
+    df['Experience Level'] = df['Experience Level'].fillna('Not Specified')
     
     # Change Exp level
     exp_map = {
@@ -80,7 +113,7 @@ def wrangle_job_data(df):
     df['Experience_Level'] = df['Experience Level'].map(exp_map)
     df['Date Posted'] = pd.to_datetime(df['Date Posted'])
     
-    return df
+    return apply_dtype_plan(df, 'jobs')
 
 #Transitions
 def wrangle_transitions(df):
@@ -101,14 +134,24 @@ def wrangle_transitions(df):
         default='Unknown'
     )
     
-    return df
+    # wage change relative to the largest move in the frame (-1..1), plus the
+    # Upward/Downward/Lateral labels the data_cleaning variant used
+    scale = df['TransitionWageChange'].abs().max()
+    df['Wage_Change_Pct'] = df['TransitionWageChange'] / scale if scale else 0.0
+    df['Transition_Type'] = np.select(
+        [df['TransitionWageDirection'] == 1, df['TransitionWageDirection'] == -1],
+        ['Upward', 'Downward'],
+        default='Lateral'
+    )
+    
+    return apply_dtype_plan(df, 'transitions')
 
 #Trajectories
 def wrangle_trajectories(df):
     """Trajectories-10-years-dataset.csv"""
 
     demo_cols = ['woman', 're_hispanic', 're_blackNH', 're_whiteNH', 're_otherNH']
-    df[demo_cols] = df[demo_cols].fillna(0).astype(int)
+    df[demo_cols] = df[demo_cols].fillna(0)
     
     df['wage_change'] = df['wage_119cap'] - df['wage_0cap']
     df['wage_change_pct'] = (df['wage_change'] / df['wage_0cap']) * 100
@@ -119,7 +162,14 @@ def wrangle_trajectories(df):
         1, 0
     )
     
-    return df
+    # jobs held per month unemployed (months floored at 1)
+    df['Career_Stability'] = df['totjobcount'] / df['totmosUnemp10cap'].replace(0, 1)
+    
+    # dummy vars, one 0/1 column per starting sector
+    sector_dummies = pd.get_dummies(df['startingsector'], prefix='sector', dtype='int8')
+    df = pd.concat([df, sector_dummies], axis=1)
+    
+    return apply_dtype_plan(df, 'trajectories')
 
 #CPS-SIPP
 def wrangle_cps_sipp(df):
@@ -129,58 +179,148 @@ def wrangle_cps_sipp(df):
     df[wage_cols] = df[wage_cols].apply(pd.to_numeric, errors='coerce')
 
     demo_cols = ['raceeth_whiteNH', 'raceeth_blackNH', 'raceeth_Hispanic']
-    df[demo_cols] = df[demo_cols].fillna(0).astype(int)
+    df[demo_cols] = df[demo_cols].fillna(0)
     
     df['TransitionSuccess'] = np.where(
         (df['wage_DEST'] > df['wage_SRCE']) & 
         (df['jobzone_DEST'] >= df['jobzone_SRCE']), 1, 0
     )
     
-    return df
+    # 1 = stayed in the same sector; compared as values, the sides may be
+    # categoricals with different categories
+    df['sector_transition'] = np.where(
+        df['sector_SRCE'].astype(object) == df['sector_DEST'].astype(object), 1, 0
+    )
+    # -1 down a job zone, 0 same, 1 up
+    df['zone_transition'] = (df['jobzone_DEST'] - df['jobzone_SRCE']).clip(-1, 1)
+    
+    return apply_dtype_plan(df, 'employment')
+
+def split_skills(series):
+    """'Python, SQL' -> ['python', 'sql'] (stripped, case-folded, no blanks)"""
+    return series.fillna('').str.split(',').apply(
+        lambda skills: [s.strip().casefold() for s in skills if s.strip()]
+    )
+
+# every dataset, declared once; Pipeline caches each stage under Datasets/.cache
+# the big CSVs are parsed in chunks at narrow dtypes (streaming.py)
+STAGES = [
+    Stage('skills', wrangle_skill_data, source='data.csv'),
+    Stage('jobs', wrangle_job_data, source='job_data.csv'),
+    Stage('transitions', wrangle_transitions, source='Dashboard_transitions_dataset.csv',
+          reader=read_transitions),
+    Stage('trajectories', wrangle_trajectories, source='Trajectories-10-years-dataset.csv',
+          reader=read_trajectories),
+    Stage('employment', wrangle_cps_sipp, source='CPS-SIPP_dataset.csv', reader=read_cps_sipp),
+    Stage('geo', wrangle_geodata, source='USGeoData.csv'),
+]
 
 # Main Model
 class JobSkillsAnalyzer:
     def __init__(self, data_folder):
         self.data_folder = data_folder
-        self.skills_encoder = MultiLabelBinarizer()
+        self.skills_encoder = MultiLabelBinarizer(sparse_output=True)
         self.job_encoder = LabelEncoder()
         
-    def load_data(self):
-        """all datasets"""
+    def load_data(self, use_cache=True):
+        """all datasets (wrangled frames come from Datasets/.cache when unchanged)"""
 
-        skills_df = pd.read_csv(f'{self.data_folder}/data.csv')
-        self.skills_df = wrangle_skill_data(skills_df)
-        # print(self.skills_df.head())
+        self.pipeline = Pipeline(self.data_folder, STAGES, use_cache=use_cache)
         
-        jobs_df = pd.read_csv(f'{self.data_folder}/job_data.csv')
-        self.jobs_df = wrangle_job_data(jobs_df)
-        # print(self.jobs_df.head())
+        self.skills_df = self.pipeline.get('skills')
+        self.jobs_df = self.pipeline.get('jobs')
+        self.transitions_df = self.pipeline.get('transitions')
+        self.trajectories_df = self.pipeline.get('trajectories')
+        self.employment_df = self.pipeline.get('employment')
         
-        transitions_df = pd.read_csv(f'{self.data_folder}/Dashboard_transitions_dataset.csv')
-        self.transitions_df = wrangle_transitions(transitions_df)
-        # print(self.transitions_df.head())
+        self._build_skill_matrix()
+        self._build_skill_index()
+        self.career_graph = CareerGraph.from_transitions(self.transitions_df)
+        self._career_path_stats = None
+        logger.info(f"Resident frames (MB): {self.memory_usage()}")
         
-        trajectories_df = pd.read_csv(f'{self.data_folder}/Trajectories-10-years-dataset.csv')
-        self.trajectories_df = wrangle_trajectories(trajectories_df)
-        # print(self.trajectories_df.head())
+        return self
+    
+    def memory_usage(self):
+        """Resident MB per wrangled frame, before and after the dtype plan"""
+        return memory_report({
+            'skills': self.skills_df,
+            'jobs': self.jobs_df,
+            'transitions': self.transitions_df,
+            'trajectories': self.trajectories_df,
+            'employment': self.employment_df
+        })
+    
+    def _build_skill_matrix(self):
+        """jobs x skills binary matrix, built once instead of per query"""
+        job_skills = split_skills(self.jobs_df['Required Skills'])
+        self.job_skill_matrix = self.skills_encoder.fit_transform(job_skills).tocsr()
+        self.skill_columns = {skill: i for i, skill in enumerate(self.skills_encoder.classes_)}
+        self.job_skill_counts = np.asarray(self.job_skill_matrix.sum(axis=1)).ravel()
+        # title -> positional rows, so a query only touches candidate jobs
+        self.job_title_rows = self.jobs_df.groupby('Job Title', observed=True).indices
+    
+    def _build_skill_index(self):
+        """Inverted index: canonical skill -> job rows, plus frequency/salary aggregates"""
+        by_skill = self.job_skill_matrix.tocsc()
+        n_jobs = by_skill.shape[0]
         
-        employment_df = pd.read_csv(f'{self.data_folder}/CPS-SIPP_dataset.csv')
-        self.employment_df = wrangle_cps_sipp(employment_df)
-        # print(self.employment_df.head())
+        salary = self.jobs_df['Salary_Avg'].to_numpy(dtype=float)
+        has_salary = ~np.isnan(salary)
+        salary_sums = by_skill.T @ np.where(has_salary, salary, 0.0)
+        salary_counts = by_skill.T @ has_salary.astype(float)
+        job_counts = np.diff(by_skill.indptr)
         
-        return self
+        self.skill_index = {}
+        self.skill_stats = {}
+        for col, skill in enumerate(self.skills_encoder.classes_):
+            self.skill_index[skill] = by_skill.indices[by_skill.indptr[col]:by_skill.indptr[col + 1]]
+            self.skill_stats[skill] = (
+                float(job_counts[col] / n_jobs) if n_jobs else 0.0,
+                float(salary_sums[col] / salary_counts[col]) if salary_counts[col] else np.nan
+            )
+        
+        # first spelling seen for each canonical skill, for display
+        raw = self.jobs_df['Required Skills'].dropna().str.split(',').explode().str.strip()
+        raw = raw[raw != '']
+        self.skill_names = dict(zip(raw.str.casefold()[::-1], raw[::-1]))
+    
+    def skill_match_scores(self, skills, rows=None):
+        """Jaccard similarity of a skill list against every job (or just `rows`)"""
+        current_skills = {s.strip().casefold() for s in skills if s and s.strip()}
+        cols = [self.skill_columns[s] for s in current_skills if s in self.skill_columns]
+        
+        matrix = self.job_skill_matrix if rows is None else self.job_skill_matrix[rows]
+        counts = self.job_skill_counts if rows is None else self.job_skill_counts[rows]
+        
+        # sums only the query's columns -> cost follows their non-zeros
+        if cols:
+            overlap = np.asarray(matrix[:, cols].sum(axis=1)).ravel()
+        else:
+            overlap = np.zeros(matrix.shape[0])
+        union = counts + len(current_skills) - overlap
+        
+        return np.divide(
+            overlap, union,
+            out=np.zeros(matrix.shape[0], dtype=float),
+            where=union > 0
+        )
     
     def analyze_career_paths(self):
         """Analyze career transition patterns and success rates"""
         
+        # the data is static once loaded, so do the groupbys once
+        if self._career_path_stats is not None:
+            return self._career_path_stats
+        
         transition_analysis = {
             'success_rate': self.transitions_df['TransitionWageDirection'].mean(),
             'avg_wage_change': self.transitions_df['TransitionWageChange'].mean(),
-            'common_paths': self.transitions_df.groupby(['SOCTitle', 'TransitionSOCTitle']).size().nlargest(10),
+            'common_paths': self.transitions_df.groupby(['SOCTitle', 'TransitionSOCTitle'], observed=True).size().nlargest(10),
             'upward_mobility': (
                 self.transitions_df[self.transitions_df['TransitionWageDirection'] == 1]
-                .groupby('SOCTitle')['TransitionSOCTitle']
-                .agg(list)
+                .groupby('SOCTitle', observed=True)['TransitionSOCTitle']
+                .apply(list)
             )
         }
         
@@ -192,30 +332,37 @@ class JobSkillsAnalyzer:
             )
         }
         
-        return {
+        self._career_path_stats = {
             'transitions': transition_analysis,
             'trajectories': trajectory_analysis
         }
+        return self._career_path_stats
     
     def predict_next_job(self, current_job, skills):
         """Predict potential next career move based on current job and skills"""
 
-        # set or list
-        current_skills = set(skills)
+        # title -> SOC codes -> their transition rows, no frame scan
+        current_codes = self.career_graph.resolve(current_job)
+        similar_transitions = self.transitions_df.iloc[
+            self.career_graph.transition_rows(current_codes)
+        ]
         
-        self.jobs_df['skills_set'] = self.jobs_df['Required Skills'].str.split(',').apply(set)
-
-        # lambda now works
-        self.jobs_df['skill_match'] = self.jobs_df['skills_set'].apply(
-            lambda x: len(current_skills.intersection(x)) / len(current_skills.union(x))
-        )
+        # only jobs that a transition can land on need scoring
+        rows = np.array([
+            row
+            for title in similar_transitions['TransitionSOCTitle'].unique()
+            for row in self.job_title_rows.get(title, ())
+        ], dtype=np.intp)
         
-        similar_transitions = self.transitions_df[
-            self.transitions_df['SOCTitle'].str.contains(current_job, case=False)
-        ]
+        # local frame, the shared jobs_df is never written to
+        job_matches = pd.DataFrame({
+            'Job Title': self.jobs_df['Job Title'].values[rows],
+            'skill_match': self.skill_match_scores(skills, rows),
+            'Salary_Avg': self.jobs_df['Salary_Avg'].values[rows]
+        })
         
         potential_jobs = similar_transitions.merge(
-            self.jobs_df[['Job Title', 'skill_match', 'Salary_Avg']],
+            job_matches,
             left_on='TransitionSOCTitle',
             right_on='Job Title',
             how='inner'
@@ -231,46 +378,48 @@ class JobSkillsAnalyzer:
             'avg_wage_increase': recommendations['TransitionWageChange'].mean()
         }
     
+    def best_career_path(self, from_job, to_job, max_hops=3):
+        """Best wage-gain path of at most max_hops transitions between two titles"""
+        return self.career_graph.best_path_by_title(from_job, to_job, max_hops)
+    
     def get_skill_recommendations(self, target_job):
         """Get recommended skills for a target job"""
 
-        target_jobs = self.jobs_df[
-            self.jobs_df['Job Title'].str.contains(target_job, case=False)
+        # scan the distinct titles, not every posting
+        target = target_job.casefold()
+        target_rows = [
+            rows for title, rows in self.job_title_rows.items()
+            if target in str(title).casefold()
         ]
         
-        if target_jobs.empty:
+        if not target_rows:
             return {'error': 'Target job not found'}
         
         # set or list
-        target_skills = set()
-        for skills in target_jobs['Required Skills'].str.split(','):
-            target_skills.update(skills)
-        
-        successful_transitions = self.transitions_df[
-            (self.transitions_df['TransitionSOCTitle'].str.contains(target_job, case=False)) &
-            (self.transitions_df['TransitionWageDirection'] == 1)
-        ]
+        target_matrix = self.job_skill_matrix[np.concatenate(target_rows)]
+        target_skills = {
+            self.skills_encoder.classes_[col] for col in np.unique(target_matrix.indices)
+        }
         
         similar_roles = self.skills_df[
-            self.skills_df['Career'].str.contains(target_job, case=False)
+            self.skills_df['Career'].str.contains(target_job, case=False, regex=False)
         ]
         
         role_skills = set()
         for skills in similar_roles['Skill']:
-            role_skills.update(skills)
+            if isinstance(skills, list):
+                role_skills.update(s.strip().casefold() for s in skills if s.strip())
             
         # Combine
         all_skills = target_skills.union(role_skills)
         
-        # Everytyhing
+        # Everytyhing, straight from the precomputed index
         skill_scores = {}
         for skill in all_skills:
-            jobs_with_skill = self.jobs_df[
-                self.jobs_df['Required Skills'].str.contains(skill, case=False)
-            ]
-            skill_scores[skill] = {
-                'frequency': len(jobs_with_skill) / len(self.jobs_df),
-                'avg_salary': jobs_with_skill['Salary_Avg'].mean(),
+            frequency, avg_salary = self.skill_stats.get(skill, (0.0, np.nan))
+            skill_scores[self.skill_names.get(skill, skill)] = {
+                'frequency': frequency,
+                'avg_salary': avg_salary,
                 'in_target_requirements': skill in target_skills
             }
         
@@ -279,7 +428,7 @@ class JobSkillsAnalyzer:
             key=lambda x: (
                 x[1]['in_target_requirements'],
                 x[1]['frequency'],
-                x[1]['avg_salary']
+                -np.inf if np.isnan(x[1]['avg_salary']) else x[1]['avg_salary']
             ),
             reverse=True
         )
@@ -0,0 +1,126 @@
+import os
+import sys
+import math
+import time
+import logging
+from typing import List, Optional
+
+import numpy as np
+
+# DataWrangle lives at the repo root, one level above backend/
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from DataWrangle.wrangling import JobSkillsAnalyzer
+
+
+logger = logging.getLogger(__name__)
+
+DATASETS_DIR = os.getenv("DATASETS_DIR", os.path.join(REPO_ROOT, "Datasets"))
+
+_analyzer: Optional[JobSkillsAnalyzer] = None
+_load_error: Optional[str] = None
+
+
+def load_analyzer(data_folder: str = DATASETS_DIR) -> Optional[JobSkillsAnalyzer]:
+    """Load and wrangle every dataset once; the result stays resident"""
+    global _analyzer, _load_error
+    start = time.perf_counter()
+    try:
+        _analyzer = JobSkillsAnalyzer(data_folder).load_data()
+        _load_error = None
+        logger.info(f"JobSkillsAnalyzer loaded in {time.perf_counter() - start:.1f}s")
+    except Exception as e:
+        _analyzer = None
+        _load_error = str(e)
+        logger.error(f"Could not load JobSkillsAnalyzer from {data_folder}: {e}")
+    return _analyzer
+
+
+def get_analyzer() -> Optional[JobSkillsAnalyzer]:
+    return _analyzer
+
+
+def status() -> dict:
+    return {
+        "ready": _analyzer is not None,
+        "error": _load_error,
+        "memory_mb": _analyzer.memory_usage() if _analyzer is not None else None
+    }
+
+
+def _clean(value):
+    """numpy/pandas scalars -> plain JSON values (NaN -> None)"""
+    if isinstance(value, np.float32):
+        # shortest repr, so 32.17 doesn't come back as 32.16999816894531
+        value = float(str(value))
+    elif hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _records(df) -> List[dict]:
+    # float32 columns through their shortest repr, same as _clean
+    float32_columns = df.select_dtypes("float32").columns
+    if len(float32_columns):
+        df = df.astype({col: str for col in float32_columns}).astype({col: float for col in float32_columns})
+    return [
+        {key: _clean(value) for key, value in row.items()}
+        for row in df.to_dict("records")
+    ]
+
+
+def local_recommendation(current_job: str, skills: List[str],
+                         target_job: Optional[str] = None) -> dict:
+    """Next-job and skill recommendations straight from the resident analyzer"""
+    analyzer = _analyzer
+    if analyzer is None:
+        raise RuntimeError(f"Analyzer not loaded: {_load_error}")
+
+    prediction = analyzer.predict_next_job(current_job, skills)
+    next_jobs = _records(prediction["recommended_jobs"])
+
+    # default to the best predicted move, else the job they already have
+    if not target_job:
+        target_job = next_jobs[0]["Job Title"] if next_jobs else current_job
+    skill_recs = analyzer.get_skill_recommendations(target_job)
+
+    return {
+        "current_job": current_job,
+        "target_job": target_job,
+        "next_jobs": next_jobs,
+        "avg_wage_increase": _clean(prediction["avg_wage_increase"]),
+        "essential_skills": skill_recs.get("essential_skills", []),
+        "recommended_skills": skill_recs.get("recommended_skills", []),
+        "error": skill_recs.get("error")
+    }
+
+
+def career_path(from_job: str, to_job: str, max_hops: int = 3) -> Optional[dict]:
+    analyzer = _analyzer
+    if analyzer is None:
+        raise RuntimeError(f"Analyzer not loaded: {_load_error}")
+    return analyzer.best_career_path(from_job, to_job, max_hops)
+
+
+def next_hops(current_job: str, limit: int = 10, upward_only: bool = False) -> List[dict]:
+    analyzer = _analyzer
+    if analyzer is None:
+        raise RuntimeError(f"Analyzer not loaded: {_load_error}")
+    graph = analyzer.career_graph
+    hops = []
+    for code in graph.resolve(current_job, limit=3):
+        for edge in graph.next_hops(code, direction=1 if upward_only else None, limit=limit):
+            hops.append({
+                "from_soc": code,
+                "from_title": graph.titles.get(code),
+                "soc": edge.target,
+                "title": graph.titles.get(edge.target),
+                "wage_change": edge.wage_change,
+                "direction": edge.direction
+            })
+    hops.sort(key=lambda hop: hop["wage_change"], reverse=True)
+    return hops[:limit]
@@ -0,0 +1,199 @@
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Iterable, Optional
+
+
+CACHE_DB_PATH = os.getenv("CACHE_DB_PATH", "career_cache.db")
+# a disk hit only rewrites last_access when it's older than this; eviction
+# order doesn't need better than hour precision, and a read stays a read
+CACHE_TOUCH_INTERVAL = float(os.getenv("CACHE_TOUCH_INTERVAL", "3600"))
+
+# the SQLite tier runs here, off the event loop (same idea as db.run)
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache")
+
+# bump when the recommendation prompts change so old answers are ignored
+RECOMMENDATION_PROMPT_VERSION = "2"
+
+
+def normalize_skills(skills: Iterable[str]) -> list:
+    """Sorted, case-folded, de-duplicated skill list"""
+    return sorted({s.strip().casefold() for s in skills if s and s.strip()})
+
+
+def normalize_location(location: str) -> str:
+    return " ".join((location or "").casefold().split())
+
+
+def make_key(*parts: Any) -> str:
+    """Canonical sha256 of the given parts"""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def recommendation_key(kind: str, skills: Iterable[str], location: str) -> str:
+    return make_key(
+        kind,
+        RECOMMENDATION_PROMPT_VERSION,
+        normalize_skills(skills),
+        normalize_location(location)
+    )
+
+
+class TieredCache:
+    """In-process LRU in front of a persistent SQLite table
+
+    Values are kept as JSON text in both tiers so callers always get a
+    fresh copy they are free to mutate. Memory hits answer inline; the
+    SQLite tier runs on the cache thread pool.
+    """
+
+    def __init__(self, namespace: str, db_path: str = CACHE_DB_PATH,
+                 max_memory_items: int = 1024, max_disk_items: int = 50000,
+                 ttl: Optional[float] = 7 * 24 * 3600):
+        self.namespace = namespace
+        self.db_path = db_path
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        self.ttl = ttl
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lru = OrderedDict()
+        # memory tier lock is never held across disk I/O
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._writes = 0
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT,
+                key TEXT,
+                value TEXT,
+                expires_at REAL,
+                last_access REAL,
+                PRIMARY KEY (namespace, key)
+            ) WITHOUT ROWID
+        ''')
+        self._conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_cache_entries_access
+            ON cache_entries (namespace, last_access)
+        ''')
+        self._conn.commit()
+
+    def _expired(self, expires_at: Optional[float], now: float) -> bool:
+        return expires_at is not None and expires_at < now
+
+    async def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                payload, expires_at = entry
+                if not self._expired(expires_at, now):
+                    self._lru.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(payload)
+                del self._lru[key]
+
+        row = await self._run(self._disk_get, key, now)
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self._remember(key, row[0], row[1])
+            self.hits += 1
+            self.disk_hits += 1
+        return json.loads(row[0])
+
+    async def set(self, key: str, value: Any):
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else None
+        payload = json.dumps(value)
+        with self._lock:
+            self._remember(key, payload, expires_at)
+        await self._run(self._disk_set, key, payload, expires_at, now)
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, partial(fn, *args))
+
+    def _disk_get(self, key: str, now: float):
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, last_access FROM cache_entries "
+                "WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+            if row is None or self._expired(row[1], now):
+                return None
+            if row[2] is None or now - row[2] > CACHE_TOUCH_INTERVAL:
+                self._conn.execute(
+                    "UPDATE cache_entries SET last_access = ? WHERE namespace = ? AND key = ?",
+                    (now, self.namespace, key)
+                )
+                self._conn.commit()
+            return row[0], row[1]
+
+    def _disk_set(self, key: str, payload: str, expires_at: Optional[float], now: float):
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, payload, expires_at, now)
+            )
+            self._writes += 1
+            # evicting on every write would be wasteful
+            if self._writes % 100 == 0:
+                self._evict(now)
+            self._conn.commit()
+
+    def _remember(self, key: str, payload: str, expires_at: Optional[float]):
+        self._lru[key] = (payload, expires_at)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_memory_items:
+            self._lru.popitem(last=False)
+
+    def _evict(self, now: float):
+        """Drop expired rows, then the least recently used ones over the size cap"""
+        self._conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND expires_at < ?",
+            (self.namespace, now)
+        )
+        self._conn.execute('''
+            DELETE FROM cache_entries WHERE namespace = ? AND key IN (
+                SELECT key FROM cache_entries WHERE namespace = ?
+                ORDER BY last_access DESC LIMIT -1 OFFSET ?
+            )
+        ''', (self.namespace, self.namespace, self.max_disk_items))
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+        with self._db_lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "memory_items": len(self._lru)
+        }
+
+
+recommendation_cache = TieredCache("recommendations")
+# content addressed, so entries only go stale when the resume prompt changes
+resume_cache = TieredCache("resumes", max_memory_items=256, ttl=30 * 24 * 3600)
@@ -0,0 +1,334 @@
+import os
+import queue
+import sqlite3
+import asyncio
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Iterable, List, Optional
+
+
+DB_PATH = os.getenv("DB_PATH", "career_advisor.db")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "4"))
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-16000",       # ~16 MB page cache per connection
+    "PRAGMA mmap_size=268435456",     # 256 MB
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Kept as module constants so every call reuses the same text and hits
+# sqlite3's per-connection prepared statement cache
+SQL_INSERT_USER = "INSERT INTO users (email, created_at) VALUES (?, ?)"
+SQL_UPSERT_PROFILE = """
+    INSERT OR REPLACE INTO user_profiles
+    (user_id, skills, location, resume_path, last_updated)
+    VALUES (?, ?, ?, ?, ?)
+"""
+SQL_SELECT_PROFILE = "SELECT skills, location FROM user_profiles WHERE user_id = ?"
+SQL_INSERT_SKILL = "INSERT OR IGNORE INTO skills (name) VALUES (?)"
+SQL_DELETE_USER_SKILLS = "DELETE FROM user_skills WHERE user_id = ?"
+SQL_INSERT_USER_SKILL = """
+    INSERT OR IGNORE INTO user_skills (user_id, skill_id)
+    SELECT ?, id FROM skills WHERE name = ?
+"""
+SQL_USERS_WITH_SKILL = """
+    SELECT us.user_id FROM skills s
+    JOIN user_skills us ON us.skill_id = s.id
+    WHERE s.name = ?
+    ORDER BY us.user_id
+"""
+SQL_INSERT_RECOMMENDATION = """
+    INSERT INTO career_recommendations
+    (user_id, recommended_job, confidence_score, created_at)
+    VALUES (?, ?, ?, ?)
+"""
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False, cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class ConnectionPool:
+    """Fixed set of long-lived connections handed out one per thread"""
+
+    def __init__(self, path: str = DB_PATH, size: int = DB_POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                return _connect(self.path)
+        return self._idle.get()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        self._opened = 0
+
+
+pool = ConnectionPool()
+# one thread per pooled connection so queries never wait on each other for a thread
+_executor = ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix="db")
+
+
+def _call(fn, *args):
+    with pool.connection() as conn:
+        return fn(conn, *args)
+
+
+async def run(fn, *args):
+    """Run fn(conn, *args) on a pooled connection, off the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(_call, fn, *args))
+
+
+def close():
+    pool.close()
+
+
+# DB Hell
+# Schema changes go through PRAGMA user_version; append, never edit, steps.
+def _migration_1(conn: sqlite3.Connection):
+    """Original schema"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT UNIQUE,
+            created_at TIMESTAMP
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS user_profiles (
+            user_id INTEGER,
+            skills TEXT,
+            location TEXT,
+            resume_path TEXT,
+            last_updated TIMESTAMP,
+            FOREIGN KEY(user_id) REFERENCES users(id)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS career_recommendations (
+            user_id INTEGER,
+            recommended_job TEXT,
+            confidence_score FLOAT,
+            created_at TIMESTAMP,
+            FOREIGN KEY(user_id) REFERENCES users(id)
+        )
+    ''')
+
+
+def _migration_2(conn: sqlite3.Connection):
+    """Key user_profiles on user_id, add indexes and the normalized skills tables"""
+    conn.execute('''
+        CREATE TABLE user_profiles_new (
+            user_id INTEGER PRIMARY KEY,
+            skills TEXT,
+            location TEXT,
+            resume_path TEXT,
+            last_updated TIMESTAMP,
+            FOREIGN KEY(user_id) REFERENCES users(id)
+        )
+    ''')
+    # the old table never replaced anything, so keep the newest row per user
+    conn.execute('''
+        INSERT INTO user_profiles_new
+        SELECT user_id, skills, location, resume_path, last_updated
+        FROM user_profiles
+        WHERE rowid IN (
+            SELECT MAX(rowid) FROM user_profiles
+            WHERE user_id IS NOT NULL
+            GROUP BY user_id
+        )
+    ''')
+    conn.execute("DROP TABLE user_profiles")
+    conn.execute("ALTER TABLE user_profiles_new RENAME TO user_profiles")
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_users_created_at ON users (created_at)")
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_recommendations_user_created
+        ON career_recommendations (user_id, created_at)
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_recommendations_created
+        ON career_recommendations (created_at)
+    ''')
+
+    conn.execute('''
+        CREATE TABLE skills (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE COLLATE NOCASE
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE user_skills (
+            user_id INTEGER NOT NULL,
+            skill_id INTEGER NOT NULL,
+            PRIMARY KEY (user_id, skill_id),
+            FOREIGN KEY(user_id) REFERENCES users(id),
+            FOREIGN KEY(skill_id) REFERENCES skills(id)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute("CREATE INDEX idx_user_skills_skill ON user_skills (skill_id, user_id)")
+
+    rows = conn.execute("SELECT user_id, skills FROM user_profiles").fetchall()
+    for user_id, skills in rows:
+        _replace_user_skills(conn, user_id, (skills or "").split(","))
+
+
+def _migration_3(conn: sqlite3.Connection):
+    """Durable background job queue (see job_queue.py)"""
+    conn.execute('''
+        CREATE TABLE jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL,
+            stage TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            result TEXT,
+            error TEXT,
+            worker TEXT,
+            lease_until REAL,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL
+        )
+    ''')
+    # claiming scans queued/expired jobs oldest first
+    conn.execute("CREATE INDEX idx_jobs_status_created ON jobs (status, created_at)")
+
+
+MIGRATIONS = [_migration_1, _migration_2, _migration_3]
+
+
+def migrate(conn: sqlite3.Connection):
+    """Apply every migration newer than the database's user_version"""
+    while True:
+        # lock first: another process (uvicorn --workers, job workers) may be
+        # migrating too, and the version it leaves behind is the one that counts
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= len(MIGRATIONS):
+                conn.rollback()
+                return
+            MIGRATIONS[version](conn)
+            conn.execute(f"PRAGMA user_version = {version + 1}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+def init_db():
+    with pool.connection() as conn:
+        migrate(conn)
+
+
+# Queries
+def _create_user(conn: sqlite3.Connection, email: str) -> int:
+    with conn:
+        cursor = conn.execute(SQL_INSERT_USER, (email, datetime.now()))
+    return cursor.lastrowid
+
+
+def _clean_skills(skills: Iterable[str]) -> List[str]:
+    """Strip and de-duplicate case-insensitively, keeping first spelling"""
+    seen = {}
+    for skill in skills:
+        skill = (skill or "").strip()
+        if skill and skill.casefold() not in seen:
+            seen[skill.casefold()] = skill
+    return list(seen.values())
+
+
+def _replace_user_skills(conn: sqlite3.Connection, user_id: int, skills: Iterable[str]):
+    skills = _clean_skills(skills)
+    conn.executemany(SQL_INSERT_SKILL, [(skill,) for skill in skills])
+    conn.execute(SQL_DELETE_USER_SKILLS, (user_id,))
+    conn.executemany(SQL_INSERT_USER_SKILL, [(user_id, skill) for skill in skills])
+
+
+def _upsert_profile(conn: sqlite3.Connection, user_id: int, skills: Iterable[str],
+                    location: str, resume_path: Optional[str]):
+    skills = _clean_skills(skills)
+    with conn:
+        conn.execute(SQL_UPSERT_PROFILE, (
+            user_id,
+            ",".join(skills),
+            location,
+            resume_path,
+            datetime.now()
+        ))
+        _replace_user_skills(conn, user_id, skills)
+
+
+def _get_profile(conn: sqlite3.Connection, user_id: int) -> Optional[dict]:
+    row = conn.execute(SQL_SELECT_PROFILE, (user_id,)).fetchone()
+    return dict(row) if row else None
+
+
+def _users_with_skill(conn: sqlite3.Connection, skill: str) -> List[int]:
+    return [row[0] for row in conn.execute(SQL_USERS_WITH_SKILL, (skill.strip(),))]
+
+
+def _add_recommendation(conn: sqlite3.Connection, user_id: int, job_title: str,
+                        confidence_score: float):
+    with conn:
+        conn.execute(SQL_INSERT_RECOMMENDATION, (
+            user_id, job_title, confidence_score, datetime.now()
+        ))
+
+
+async def create_user(email: str) -> int:
+    """Insert a user and return its id (raises sqlite3.IntegrityError on duplicates)"""
+    return await run(_create_user, email)
+
+
+async def upsert_profile(user_id: int, skills: Iterable[str], location: str,
+                         resume_path: Optional[str] = None):
+    await run(_upsert_profile, user_id, skills, location, resume_path)
+
+
+async def get_profile(user_id: int) -> Optional[dict]:
+    return await run(_get_profile, user_id)
+
+
+async def users_with_skill(skill: str) -> List[int]:
+    """Ids of users whose profile lists the skill (case-insensitive)"""
+    return await run(_users_with_skill, skill)
+
+
+async def add_recommendation(user_id: int, job_title: str, confidence_score: float):
+    await run(_add_recommendation, user_id, job_title, confidence_score)
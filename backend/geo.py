@@ -0,0 +1,258 @@
+import os
+import re
+import glob
+import time
+import hashlib
+import logging
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+# also puts the repo root on sys.path for DataWrangle
+from analyzer_service import DATASETS_DIR
+from DataWrangle.pipeline import Pipeline
+from DataWrangle.wrangling import STAGES
+
+
+logger = logging.getLogger(__name__)
+
+# bump when the npz layout changes
+GEO_INDEX_VERSION = "1"
+EARTH_RADIUS_MILES = 3958.8
+
+_ZIP_RE = re.compile(r'\b(\d{5})(?:-?(\d{4}))?\b')
+_CITY_STATE_RE = re.compile(r'^(?P<city>[^,]+?)\s*,?\s+(?P<state>[A-Za-z]{2})$')
+_REMOTE = {"remote", "anywhere", "remote, us", "work from home", "wfh"}
+
+
+class Place(NamedTuple):
+    city: str
+    state: str
+    fips: str
+    latitude: float
+    longitude: float
+    zip: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.city}, {self.state}"
+
+
+def _city_key(city: str, state: str = "") -> str:
+    key = " ".join(str(city).casefold().split())
+    return f"{key}, {state.casefold()}" if state else key
+
+
+def to_unit_xyz(lat, lon) -> np.ndarray:
+    """lat/long degrees -> points on the unit sphere, so Euclidean KD-tree distances work"""
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def miles_to_chord(miles: float) -> float:
+    angle = min(miles / EARTH_RADIUS_MILES, np.pi)
+    return 2 * np.sin(angle / 2)
+
+
+class GeoIndex:
+    """ZIP/ZIP+4 and city lookups plus a KD-tree over city centroids
+
+    ZIP rows sit in sorted int arrays (binary search, nothing to build on
+    load); cities are small enough for a dict and the KD-tree.
+    """
+
+    ARRAYS = (
+        'zip9', 'row_city', 'row_fips', 'row_lat', 'row_lon',
+        'city_names', 'city_states', 'city_fips', 'city_lat', 'city_lon', 'city_counts'
+    )
+
+    def __init__(self, **arrays):
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self.zip5 = self.zip9 // 10000
+        self._cities = {
+            _city_key(city, state): i
+            for i, (city, state) in enumerate(zip(self.city_names, self.city_states))
+        }
+        # bare city name -> the one with the most ZIPs ("Austin" -> Austin, TX)
+        self._city_names = {}
+        for i in np.argsort(-self.city_counts, kind='stable'):
+            self._city_names.setdefault(_city_key(self.city_names[i]), int(i))
+        self.tree = cKDTree(to_unit_xyz(self.city_lat, self.city_lon)) if len(self.city_lat) else None
+
+    @classmethod
+    def from_frame(cls, df):
+        """Build from the wrangled USGeoData frame"""
+        df = df[(df['Latitude'] != 0) | (df['Longitude'] != 0)]
+        df = df[df['ZipCodePlus4'].astype(str).str.len() >= 5]
+        digits = df['ZipCodePlus4'].astype(str)
+        zip9 = digits.str[:5].astype(np.int64) * 10000 + \
+            digits.str[5:9].replace('', '0').astype(np.int64)
+
+        order = np.argsort(zip9.to_numpy(), kind='stable')
+        df = df.iloc[order]
+        cities = df['City'].astype(str).str.strip().str.title()
+        states = df['State'].astype(str).str.strip().str.upper()
+
+        city_codes, city_table = (cities + '|' + states).factorize()
+        city_names, city_states = zip(*(key.split('|') for key in city_table)) if len(city_table) else ((), ())
+        grouped = df.assign(city=city_codes).groupby('city')
+
+        fips = df['FIPSCode'].astype(str).str.zfill(5)
+        return cls(
+            zip9=zip9.to_numpy()[order],
+            row_city=city_codes.astype(np.int32),
+            row_fips=fips.astype(np.int32).to_numpy(),
+            row_lat=df['Latitude'].to_numpy(dtype=np.float32),
+            row_lon=df['Longitude'].to_numpy(dtype=np.float32),
+            city_names=np.array(city_names, dtype=str),
+            city_states=np.array(city_states, dtype=str),
+            city_fips=grouped['FIPSCode'].agg(lambda s: s.astype(str).mode().iloc[0]).astype(np.int32).to_numpy(),
+            city_lat=grouped['Latitude'].mean().to_numpy(dtype=np.float32),
+            city_lon=grouped['Longitude'].mean().to_numpy(dtype=np.float32),
+            city_counts=grouped.size().to_numpy(dtype=np.int32),
+        )
+
+    def save(self, path: str):
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, **{name: getattr(self, name) for name in self.ARRAYS})
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "GeoIndex":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(**{name: data[name] for name in cls.ARRAYS})
+
+    def _city_place(self, i: int, zip_code: Optional[str] = None) -> Place:
+        return Place(
+            city=str(self.city_names[i]),
+            state=str(self.city_states[i]),
+            fips=f"{int(self.city_fips[i]):05d}",
+            latitude=round(float(self.city_lat[i]), 5),
+            longitude=round(float(self.city_lon[i]), 5),
+            zip=zip_code
+        )
+
+    def by_zip(self, zip5: str, plus4: Optional[str] = None) -> Optional[Place]:
+        if plus4:
+            value = int(zip5) * 10000 + int(plus4)
+            row = np.searchsorted(self.zip9, value)
+            if row < len(self.zip9) and self.zip9[row] == value:
+                return self._row_place(row, f"{zip5}-{plus4}")
+        row = np.searchsorted(self.zip5, int(zip5))
+        if row < len(self.zip5) and self.zip5[row] == int(zip5):
+            return self._row_place(row, zip5)
+        return None
+
+    def _row_place(self, row: int, zip_code: str) -> Place:
+        city = int(self.row_city[row])
+        return Place(
+            city=str(self.city_names[city]),
+            state=str(self.city_states[city]),
+            fips=f"{int(self.row_fips[row]):05d}",
+            latitude=round(float(self.row_lat[row]), 5),
+            longitude=round(float(self.row_lon[row]), 5),
+            zip=zip_code
+        )
+
+    def by_city(self, city: str, state: Optional[str] = None) -> Optional[Place]:
+        i = self._cities.get(_city_key(city, state)) if state else self._city_names.get(_city_key(city))
+        return self._city_place(i) if i is not None else None
+
+    def resolve(self, location: str) -> Optional[Place]:
+        """'94105', '94105-1234', 'San Francisco, CA', 'austin tx', 'Austin' -> Place"""
+        text = " ".join((location or "").split())
+        if not text:
+            return None
+        zip_match = _ZIP_RE.search(text)
+        if zip_match:
+            place = self.by_zip(*zip_match.groups())
+            if place:
+                return place
+            text = " ".join(_ZIP_RE.sub("", text).split()).rstrip(",")
+        match = _CITY_STATE_RE.match(text)
+        if match:
+            place = self.by_city(match['city'], match['state'])
+            if place:
+                return place
+        return self.by_city(text.split(",")[0])
+
+    def nearby(self, place: Place, miles: float) -> List[Place]:
+        """Cities whose centroid is within `miles` of a place, closest first"""
+        if self.tree is None:
+            return []
+        center = to_unit_xyz([place.latitude], [place.longitude])[0]
+        rows = self.tree.query_ball_point(center, miles_to_chord(miles))
+        distances = np.linalg.norm(self.tree.data[rows] - center, axis=1) if rows else []
+        return [self._city_place(int(rows[i])) for i in np.argsort(distances, kind='stable')]
+
+
+def distance_miles(a: Place, b: Place) -> float:
+    chord = np.linalg.norm(to_unit_xyz([a.latitude], [a.longitude])[0] - to_unit_xyz([b.latitude], [b.longitude])[0])
+    return float(2 * EARTH_RADIUS_MILES * np.arcsin(min(chord / 2, 1.0)))
+
+
+_index: Optional[GeoIndex] = None
+
+
+def _cache_path(pipeline: Pipeline) -> str:
+    # the pipeline key already covers USGeoData.csv + wrangle_geodata
+    key = hashlib.sha256(f"{GEO_INDEX_VERSION}|{pipeline.key('geo')}".encode()).hexdigest()[:16]
+    return os.path.join(pipeline.cache_dir, f"geo-index-{key}.npz")
+
+
+def load_geo_index(data_folder: str = DATASETS_DIR) -> Optional[GeoIndex]:
+    """GeoIndex from its npz cache, rebuilt from the geo pipeline stage when stale"""
+    global _index
+    start = time.perf_counter()
+    try:
+        pipeline = Pipeline(data_folder, STAGES)
+        path = _cache_path(pipeline)
+        if os.path.exists(path):
+            _index = GeoIndex.load(path)
+        else:
+            _index = GeoIndex.from_frame(pipeline.get('geo'))
+            try:
+                os.makedirs(pipeline.cache_dir, exist_ok=True)
+                _index.save(path)
+                for stale in glob.glob(os.path.join(pipeline.cache_dir, "geo-index-*.npz")):
+                    if stale != path:
+                        os.remove(stale)
+            except OSError as e:
+                logger.warning(f"Could not cache geo index: {e}")
+        logger.info(f"Geo index loaded in {time.perf_counter() - start:.2f}s")
+    except Exception as e:
+        _index = None
+        logger.error(f"Could not load geo index from {data_folder}: {e}")
+    return _index
+
+
+def get_geo_index() -> Optional[GeoIndex]:
+    return _index
+
+
+def resolve(location: str) -> Optional[Place]:
+    return _index.resolve(location) if _index is not None else None
+
+
+def is_remote(location: str) -> bool:
+    return " ".join((location or "").casefold().split()) in _REMOTE
+
+
+def normalize_location(location: str) -> str:
+    """Canonical 'City, ST' (or 'Remote') when we know the place, else the trimmed text"""
+    text = " ".join((location or "").split())
+    if is_remote(text):
+        return "Remote"
+    place = resolve(text)
+    return place.label if place else text
+
+
+def nearby_locations(location: str, miles: float) -> List[str]:
+    """'City, ST' labels within `miles` of a location (empty when unknown)"""
+    place = resolve(location)
+    if place is None or _index is None:
+        return []
+    return [p.label for p in _index.nearby(place, miles)]
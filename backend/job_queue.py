@@ -0,0 +1,304 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import logging
+import sqlite3
+import multiprocessing
+from typing import Any, Callable, Dict, List, Optional
+
+import db
+from cache import resume_cache, make_key
+from pdf_ingest import extract_text, shutdown_pool, PDFExtractionError
+from read_resume import analyze_resume, extract_skills, RESUME_ANALYSIS_VERSION
+
+
+logger = logging.getLogger(__name__)
+
+# Workers (override through .env); 0 = run them separately with `python job_queue.py`
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# a job whose worker stops renewing this (crash, kill) is handed to another one
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "120"))
+# a running job renews its lease this often, well before it runs out
+JOB_HEARTBEAT_SECONDS = JOB_LEASE_SECONDS / 4
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "0.2"))
+JOB_MAX_POLL_INTERVAL = 2.0
+JOB_RETENTION_DAYS = float(os.getenv("JOB_RETENTION_DAYS", "7"))
+
+SQL_INSERT_JOB = """
+    INSERT INTO jobs (id, kind, payload, status, stage, created_at)
+    VALUES (?, ?, ?, 'queued', 'queued', ?)
+"""
+# oldest queued job, or one whose lease ran out
+SQL_CLAIM_JOB = """
+    UPDATE jobs
+    SET status = 'running', stage = 'started', attempts = attempts + 1,
+        worker = ?, lease_until = ?, started_at = ?
+    WHERE id = (
+        SELECT id FROM jobs
+        WHERE status = 'queued' OR (status = 'running' AND lease_until < ? AND attempts < ?)
+        ORDER BY created_at
+        LIMIT 1
+    )
+    RETURNING id, kind, payload, attempts
+"""
+# a worker that died on its last attempt leaves the job running with an expired lease
+SQL_FAIL_EXPIRED = """
+    UPDATE jobs
+    SET status = 'failed', stage = 'failed', error = ?, lease_until = NULL, finished_at = ?
+    WHERE status = 'running' AND lease_until < ? AND attempts >= ?
+"""
+SQL_UPDATE_STAGE = "UPDATE jobs SET stage = ?, lease_until = ? WHERE id = ? AND worker = ?"
+SQL_RENEW_LEASE = "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'running'"
+SQL_FINISH_JOB = """
+    UPDATE jobs
+    SET status = ?, stage = ?, result = ?, error = ?, lease_until = NULL, finished_at = ?
+    WHERE id = ? AND worker = ?
+"""
+SQL_RETRY_JOB = """
+    UPDATE jobs SET status = 'queued', stage = 'queued', error = ?, lease_until = NULL
+    WHERE id = ? AND worker = ?
+"""
+SQL_SELECT_JOB = """
+    SELECT id, kind, status, stage, attempts, result, error, created_at, started_at, finished_at
+    FROM jobs WHERE id = ?
+"""
+SQL_PRUNE_JOBS = "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?"
+
+
+class PermanentJobError(Exception):
+    """A job that would fail the same way on every attempt; not retried"""
+
+
+# Queue operations, run through db.run like the other queries
+def _enqueue(conn: sqlite3.Connection, kind: str, payload: dict) -> str:
+    job_id = uuid.uuid4().hex
+    with conn:
+        conn.execute(SQL_INSERT_JOB, (job_id, kind, json.dumps(payload), time.time()))
+    return job_id
+
+
+def _get_job(conn: sqlite3.Connection, job_id: str) -> Optional[dict]:
+    row = conn.execute(SQL_SELECT_JOB, (job_id,)).fetchone()
+    if row is None:
+        return None
+    job = dict(row)
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+
+def _claim(conn: sqlite3.Connection, worker: str) -> Optional[dict]:
+    now = time.time()
+    with conn:
+        conn.execute(SQL_FAIL_EXPIRED, (
+            f"Lease expired on the last of {JOB_MAX_ATTEMPTS} attempts, worker lost",
+            now, now, JOB_MAX_ATTEMPTS
+        ))
+        row = conn.execute(SQL_CLAIM_JOB, (
+            worker, now + JOB_LEASE_SECONDS, now, now, JOB_MAX_ATTEMPTS
+        )).fetchone()
+    return dict(row) if row else None
+
+
+def _set_stage(conn: sqlite3.Connection, job_id: str, worker: str, stage: str):
+    with conn:
+        conn.execute(SQL_UPDATE_STAGE, (stage, time.time() + JOB_LEASE_SECONDS, job_id, worker))
+
+
+def _renew_lease(conn: sqlite3.Connection, job_id: str, worker: str) -> bool:
+    with conn:
+        cursor = conn.execute(SQL_RENEW_LEASE, (time.time() + JOB_LEASE_SECONDS, job_id, worker))
+    return cursor.rowcount > 0
+
+
+def _finish(conn: sqlite3.Connection, job_id: str, worker: str,
+            result: Any = None, error: Optional[str] = None):
+    status = "failed" if error else "done"
+    with conn:
+        conn.execute(SQL_FINISH_JOB, (
+            status, status, None if error else json.dumps(result), error, time.time(), job_id, worker
+        ))
+
+
+def _retry(conn: sqlite3.Connection, job_id: str, worker: str, error: str):
+    with conn:
+        conn.execute(SQL_RETRY_JOB, (error, job_id, worker))
+
+
+def _prune(conn: sqlite3.Connection, days: float = JOB_RETENTION_DAYS) -> int:
+    with conn:
+        return conn.execute(SQL_PRUNE_JOBS, (time.time() - days * 86400,)).rowcount
+
+
+async def enqueue(kind: str, payload: dict) -> str:
+    """Queue a job and return its id; runs as soon as a worker is free"""
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    return await db.run(_enqueue, kind, payload)
+
+
+async def get_job(job_id: str) -> Optional[dict]:
+    return await db.run(_get_job, job_id)
+
+
+# Job handlers: async fn(payload, set_stage) -> JSON-serializable result
+async def process_resume(payload: dict, set_stage: Callable[[str], None]) -> dict:
+    """PDF -> text -> analysis -> profile skills, what POST /profile used to do inline"""
+    file_path = payload["resume_path"]
+    resume_key = make_key("resume", RESUME_ANALYSIS_VERSION, payload["content_hash"])
+    cached_resume = await resume_cache.get(resume_key)
+    if cached_resume is not None:
+        resume_analysis = cached_resume["analysis"]
+    else:
+        set_stage("extracting")
+        try:
+            text = await extract_text(file_path)
+        except PDFExtractionError as e:
+            raise PermanentJobError(str(e)) from e
+
+        # local rules first, Groq only when they are unsure
+        set_stage("analyzing")
+        resume_analysis = await analyze_resume(text)
+        if resume_analysis:
+            await resume_cache.set(resume_key, {
+                "text": text,
+                "analysis": resume_analysis
+            })
+
+    resume_skills = extract_skills(resume_analysis) if resume_analysis else []
+    set_stage("saving")
+    # the profile may have changed while the job waited, build on what's there now
+    profile = await db.get_profile(payload["user_id"])
+    if profile is None:
+        profile = {"skills": ",".join(payload["skills"]), "location": payload["location"]}
+    await db.upsert_profile(
+        payload["user_id"],
+        (profile["skills"] or "").split(",") + resume_skills,
+        profile["location"],
+        file_path
+    )
+    return {"skills_extracted": len(resume_skills), "skills": resume_skills}
+
+
+HANDLERS: Dict[str, Callable] = {
+    "resume": process_resume,
+}
+
+
+# Workers
+async def _run_job(job: dict, worker: str):
+    job_id = job["id"]
+
+    def set_stage(stage: str):
+        # also renews the lease
+        with db.pool.connection() as conn:
+            _set_stage(conn, job_id, worker, stage)
+
+    async def heartbeat():
+        # long stages (big PDF, slow LLM) must not outlive the lease
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+            if not await db.run(_renew_lease, job_id, worker):
+                logger.warning(f"Job {job_id} lease lost")
+                return
+
+    start = time.perf_counter()
+    beat = asyncio.ensure_future(heartbeat())
+    try:
+        try:
+            result = await HANDLERS[job["kind"]](json.loads(job["payload"]), set_stage)
+        finally:
+            beat.cancel()
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        with db.pool.connection() as conn:
+            if isinstance(e, PermanentJobError) or job["attempts"] >= JOB_MAX_ATTEMPTS:
+                logger.error(f"Job {job_id} failed: {error}")
+                _finish(conn, job_id, worker, error=error)
+            else:
+                logger.warning(f"Job {job_id} attempt {job['attempts']} failed, requeued: {error}")
+                _retry(conn, job_id, worker, error)
+        return
+    with db.pool.connection() as conn:
+        _finish(conn, job_id, worker, result)
+    logger.info(f"Job {job_id} ({job['kind']}) done in {time.perf_counter() - start:.2f}s")
+
+
+async def _worker_loop(worker: str, stop):
+    idle = JOB_POLL_INTERVAL
+    last_prune = 0.0
+    while not stop.is_set():
+        with db.pool.connection() as conn:
+            job = _claim(conn, worker)
+            if job is None and time.time() - last_prune > 3600:
+                last_prune = time.time()
+                _prune(conn)
+        if job is None:
+            # back off while the queue is empty, snap back once there's work
+            await asyncio.sleep(idle)
+            idle = min(idle * 2, JOB_MAX_POLL_INTERVAL)
+            continue
+        idle = JOB_POLL_INTERVAL
+        await _run_job(job, worker)
+
+
+def worker_main(index: int, stop):
+    """Entry point of one worker process"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format=f'%(asctime)s - worker-{index} - %(levelname)s - %(message)s',
+        force=True
+    )
+    worker = f"{os.getpid()}-{index}"
+    try:
+        asyncio.run(_worker_loop(worker, stop))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown_pool()
+        db.close()
+
+
+_processes: List[multiprocessing.Process] = []
+_stop = None
+
+
+def start_workers(count: int = JOB_WORKERS):
+    """Spawn the worker processes (fresh interpreters: no inherited sqlite handles)"""
+    global _stop
+    if count <= 0 or _processes:
+        return
+    context = multiprocessing.get_context("spawn")
+    _stop = context.Event()
+    for index in range(count):
+        # not daemonic, workers run their own PDF process pool
+        process = context.Process(target=worker_main, args=(index, _stop), name=f"job-worker-{index}")
+        process.start()
+        _processes.append(process)
+    logger.info(f"Started {count} job workers")
+
+
+def stop_workers(timeout: float = 5.0):
+    """Let workers finish their current job; unfinished ones are picked up after restart"""
+    if _stop is not None:
+        _stop.set()
+    deadline = time.monotonic() + timeout
+    for process in _processes:
+        process.join(max(0.0, deadline - time.monotonic()))
+        if process.is_alive():
+            process.terminate()
+            process.join(1.0)
+    _processes.clear()
+
+
+if __name__ == "__main__":
+    # standalone workers against the same DB_PATH, e.g. with JOB_WORKERS=0 in the API
+    db.init_db()
+    start_workers(max(JOB_WORKERS, 1))
+    try:
+        for process in _processes:
+            process.join()
+    except KeyboardInterrupt:
+        stop_workers()
@@ -0,0 +1,325 @@
+import re
+import json
+import time
+import base64
+import bisect
+import logging
+from collections import defaultdict
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+import analyzer_service
+import geo
+
+
+logger = logging.getLogger(__name__)
+
+# a posting loses half its recency boost every RECENCY_HALF_LIFE_DAYS
+RECENCY_HALF_LIFE_DAYS = 30.0
+SKILL_WEIGHT = np.float32(1.0)
+RECENCY_WEIGHT = np.float32(0.5)
+SCAN_CHUNK = 4096
+MAX_QUERY_SKILLS = 16
+# postings at least this dense also keep a packed bitmap (n/8 bytes each)
+BITMAP_MIN_FRACTION = 1 / 64
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor that is malformed or from another index build"""
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(str(text or "").casefold())
+
+
+def _bitmap(rows: np.ndarray, size: int) -> np.ndarray:
+    """Packed bitmap (MSB first, like np.packbits) with `rows` set"""
+    bits = np.zeros((size + 7) // 8, dtype=np.uint8)
+    np.bitwise_or.at(bits, rows >> 3, (0x80 >> (rows & 7)).astype(np.uint8))
+    return bits
+
+
+def _group_rows(codes: np.ndarray) -> List[np.ndarray]:
+    """codes per row -> rows of each code (ascending), indexed by code"""
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(codes.max() + 2 if len(codes) else 1))
+    return [order[bounds[i]:bounds[i + 1]] for i in range(len(bounds) - 1)]
+
+
+class JobSearchIndex:
+    """Inverted title/skill indexes plus columnar filters over jobs_df
+
+    Postings are stored newest first (row ids are recency ranks). A query
+    turns its title tokens and skills into packed bitmaps, one per number
+    of skills matched; within such a level the score only falls as the row
+    id grows, so each level is unpacked in chunks and the scan stops as
+    soon as a page is full. Dense postings keep their bitmap precomputed.
+    Recency is measured from the newest posting, not the clock, so scores
+    and cursors are stable.
+    """
+
+    def __init__(self, df, version: Optional[str] = None):
+        start = time.perf_counter()
+        posted = df["Date Posted"].to_numpy(dtype="datetime64[D]")
+        days = posted.astype(np.int64)
+        valid = ~np.isnat(posted)
+        newest = int(days[valid].max()) if valid.any() else 0
+        age = np.where(valid, newest - days, np.inf)
+        recency = np.exp2(-age / RECENCY_HALF_LIFE_DAYS).astype(np.float32)
+
+        order = np.argsort(-recency, kind="stable")
+        df = df.iloc[order].reset_index(drop=True)
+        self.size = len(df)
+        self.recency = recency[order]
+        self.posted = posted[order]
+        # same data -> same version in every worker, so cursors work across them
+        self.version = version or f"{self.size}-{newest}"
+
+        self.titles = df["Job Title"].astype(str).to_numpy()
+        # not every jobs dataset names the employer
+        companies = df.get("Company")
+        self.companies = (
+            # categorical after the dtype plan: fillna("") would be a new category
+            companies.astype(object).fillna("").astype(str).to_numpy() if companies is not None
+            else np.full(self.size, "", dtype=object)
+        )
+        self.skills = df["Required Skills"].astype(object).fillna("").astype(str).to_numpy()
+        self.salary_min = df["Salary_Min"].to_numpy(dtype=np.float32)
+        self.salary_max = df["Salary_Max"].to_numpy(dtype=np.float32)
+
+        codes, levels = df["Experience Level"].astype(str).factorize()
+        self.experience_codes = codes.astype(np.int8)
+        self.experience_levels = np.asarray(levels, dtype=object)
+        self._experience = {level.casefold(): i for i, level in enumerate(levels)}
+
+        # locations are few: normalize each distinct one once
+        codes, labels = df["Location"].astype(str).factorize()
+        self.location_codes = codes.astype(np.int32)
+        self.location_labels = np.asarray(labels, dtype=object)
+        self._locations = defaultdict(list)
+        for i, label in enumerate(labels):
+            self._locations[geo.normalize_location(label).casefold()].append(i)
+
+        # tokenize each distinct title once, then merge those titles' rows
+        codes, titles = df["Job Title"].astype(str).factorize()
+        title_rows = _group_rows(codes)
+        by_token = defaultdict(list)
+        for code, title in enumerate(titles):
+            for token in set(tokenize(title)):
+                by_token[token].append(title_rows[code])
+        self.title_index = {
+            token: np.sort(np.concatenate(groups)).astype(np.int32)
+            for token, groups in by_token.items()
+        }
+
+        # same canonical form as split_skills: stripped, case-folded
+        exploded = df["Required Skills"].astype(object).fillna("").astype(str).str.split(",").explode()
+        skills = exploded.str.strip().str.casefold()
+        keep = (skills != "").to_numpy()
+        codes, names = skills[keep].factorize()
+        rows = exploded.index.to_numpy()[keep]
+        self.skill_index = {
+            name: np.unique(rows[group]).astype(np.int32)
+            for name, group in zip(names, _group_rows(codes))
+        }
+
+        dense = max(1, int(self.size * BITMAP_MIN_FRACTION))
+        self._dense_title_bits = {
+            token: _bitmap(rows, self.size) for token, rows in self.title_index.items() if len(rows) >= dense
+        }
+        self._dense_skill_bits = {
+            skill: _bitmap(rows, self.size) for skill, rows in self.skill_index.items() if len(rows) >= dense
+        }
+        self._all_bits = np.packbits(np.ones(self.size, dtype=bool))
+
+        logger.info(f"Job search index over {self.size} postings built in {time.perf_counter() - start:.2f}s")
+
+    def _bits(self, index: dict, bitmaps: dict, term: str) -> Optional[np.ndarray]:
+        if term in bitmaps:
+            return bitmaps[term]
+        rows = index.get(term)
+        return None if rows is None else _bitmap(rows, self.size)
+
+    def _title_bits(self, title: str) -> np.ndarray:
+        """Rows whose title has every query token"""
+        bits = self._all_bits
+        for token in set(tokenize(title)):
+            token_bits = self._bits(self.title_index, self._dense_title_bits, token)
+            if token_bits is None:
+                return np.zeros_like(self._all_bits)
+            bits = bits & token_bits
+        return bits
+
+    def _levels(self, title: str, skills: Iterable[str]):
+        """[(skill bonus, bitmap of rows matching exactly that many skills)], best first"""
+        candidates = self._title_bits(title)
+        wanted = sorted({s.strip().casefold() for s in skills if s and s.strip()})[:MAX_QUERY_SKILLS]
+        if not wanted:
+            return [(np.float32(0), candidates)]
+
+        # exact[j]: candidates matching exactly j of the skills seen so far
+        exact = [candidates]
+        for skill in wanted:
+            bits = self._bits(self.skill_index, self._dense_skill_bits, skill)
+            if bits is None:
+                exact.append(np.zeros_like(candidates))
+                continue
+            missing = ~bits
+            exact = [exact[0] & missing] + [
+                (exact[j] & missing) | (exact[j - 1] & bits) for j in range(1, len(exact))
+            ] + [exact[-1] & bits]
+
+        levels = [
+            (np.float32(SKILL_WEIGHT * matched / len(wanted)), exact[matched])
+            for matched in range(len(wanted), -1, -1)
+        ]
+        if not title.strip():
+            # skills alone: postings with none of them aren't candidates
+            levels.pop()
+        return levels
+
+    def _score(self, bonus, rows):
+        return bonus + RECENCY_WEIGHT * self.recency[rows]
+
+    def _filter(self, rows, location_ids, experience, min_salary, max_salary):
+        mask = np.ones(len(rows), dtype=bool)
+        if location_ids is not None:
+            mask &= np.isin(self.location_codes[rows], location_ids)
+        if experience is not None:
+            mask &= self.experience_codes[rows] == experience
+        if min_salary is not None:
+            mask &= self.salary_max[rows] >= min_salary
+        if max_salary is not None:
+            mask &= self.salary_min[rows] <= max_salary
+        return rows[mask]
+
+    def _location_filter(self, location: str, miles: float) -> Optional[np.ndarray]:
+        if not location:
+            return None
+        if geo.is_remote(location):
+            labels = {"remote"}
+        else:
+            labels = {label.casefold() for label in geo.nearby_locations(location, miles)}
+            labels.add(geo.normalize_location(location).casefold())
+        ids = [i for label in labels for i in self._locations.get(label, ())]
+        return np.asarray(ids, dtype=np.int32)
+
+    def search(self, title: str = "", skills: Iterable[str] = (), location: str = "",
+               miles: float = 25, experience: str = "", min_salary: Optional[float] = None,
+               max_salary: Optional[float] = None, limit: int = 20,
+               cursor: Optional[str] = None) -> dict:
+        filters = (
+            self._location_filter(location, miles),
+            self._experience.get(experience.casefold(), -1) if experience else None,
+            min_salary,
+            max_salary
+        )
+        last = self._decode_cursor(cursor) if cursor else None
+        location_ids, experience_code = filters[0], filters[1]
+        if (location_ids is not None and not len(location_ids)) or experience_code == -1:
+            return {"jobs": [], "next_cursor": None}
+
+        found_rows, found_scores = [], []
+        for bonus, bits in self._levels(title, skills):
+            begin = 0
+            if last is not None:
+                # scores fall along a level, so "after the cursor" is a suffix
+                last_score, last_row = last
+                begin = bisect.bisect_left(range(self.size), True, key=lambda row: (
+                    (score := self._score(bonus, row)) < last_score
+                    or (score == last_score and row > last_row)
+                ))
+            # limit + 1 per level is enough to fill the page and know if there's more
+            begin -= begin % 8
+            taken, step = 0, SCAN_CHUNK
+            while begin < self.size and taken <= limit:
+                window = np.unpackbits(bits[begin // 8:(begin + step) // 8])
+                chunk = (np.flatnonzero(window) + begin).astype(np.int32)
+                if last is not None:
+                    chunk = chunk[(self._score(bonus, chunk) < last[0]) | (
+                        (self._score(bonus, chunk) == last[0]) & (chunk > last[1])
+                    )]
+                hits = self._filter(chunk, *filters)[:limit + 1 - taken]
+                found_rows.append(hits)
+                found_scores.append(self._score(bonus, hits))
+                taken += len(hits)
+                # selective filters: widen the window instead of crawling
+                begin, step = begin + step, step * 2
+
+        rows = np.concatenate(found_rows) if found_rows else np.array([], dtype=np.int32)
+        scores = np.concatenate(found_scores) if found_scores else np.array([], dtype=np.float32)
+        order = np.lexsort((rows, -scores))[:limit + 1]
+        rows, scores = rows[order], scores[order]
+
+        has_more = len(rows) > limit
+        rows, scores = rows[:limit], scores[:limit]
+        return {
+            "jobs": [self._posting(int(row), float(score)) for row, score in zip(rows, scores)],
+            "next_cursor": self._encode_cursor(float(scores[-1]), int(rows[-1])) if has_more else None
+        }
+
+    def _posting(self, row: int, score: float) -> dict:
+        low, high = self.salary_min[row], self.salary_max[row]
+        return {
+            "title": self.titles[row],
+            "company": self.companies[row] or None,
+            "location": self.location_labels[self.location_codes[row]],
+            "salary": f"${low:,.0f} - ${high:,.0f}" if not np.isnan(low) else None,
+            "salary_min": None if np.isnan(low) else float(round(low)),
+            "salary_max": None if np.isnan(high) else float(round(high)),
+            "experience": self.experience_levels[self.experience_codes[row]],
+            "date_posted": None if np.isnat(self.posted[row]) else str(self.posted[row]),
+            "skills": [s.strip() for s in self.skills[row].split(",") if s.strip()],
+            "score": round(score, 4)
+        }
+
+    def _encode_cursor(self, score: float, row: int) -> str:
+        payload = json.dumps({"v": self.version, "s": score, "r": row}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def _decode_cursor(self, cursor: str):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            version, score, row = payload["v"], np.float32(payload["s"]), int(payload["r"])
+        except (ValueError, KeyError, TypeError) as e:
+            raise InvalidCursor("Malformed cursor") from e
+        if version != self.version:
+            raise InvalidCursor("Cursor is from an older job index")
+        return score, row
+
+
+_index: Optional[JobSearchIndex] = None
+
+
+def load_index() -> Optional[JobSearchIndex]:
+    """Build the search index from the resident analyzer's jobs_df"""
+    global _index
+    analyzer = analyzer_service.get_analyzer()
+    if analyzer is None:
+        logger.warning("Analyzer not loaded, job search disabled")
+        return None
+    try:
+        pipeline = getattr(analyzer, "pipeline", None)
+        _index = JobSearchIndex(analyzer.jobs_df, pipeline.key("jobs")[:16] if pipeline else None)
+    except Exception as e:
+        _index = None
+        logger.error(f"Could not build job search index: {e}")
+    return _index
+
+
+def get_index() -> Optional[JobSearchIndex]:
+    return _index
+
+
+def relevant_jobs(title: str, skills: Iterable[str], location: str = "", limit: int = 5) -> List[dict]:
+    """Best postings for a recommended role, nearby first, anywhere if none are"""
+    if _index is None:
+        return []
+    skills = list(skills)
+    jobs = _index.search(title=title, skills=skills, location=location, limit=limit)["jobs"] if location else []
+    if not jobs:
+        jobs = _index.search(title=title, skills=skills, limit=limit)["jobs"]
+    return jobs
@@ -0,0 +1,116 @@
+import json
+from typing import Any, List, Optional, Tuple
+
+
+_WHITESPACE = " \t\r\n"
+_PRIMITIVE_END = _WHITESPACE + ",}]"
+
+
+class _Frame:
+    __slots__ = ("is_object", "start", "key", "expect_key")
+
+    def __init__(self, is_object: bool, start: int):
+        self.is_object = is_object
+        self.start = start
+        # object: current key; array: current index
+        self.key: Any = None if is_object else 0
+        self.expect_key = is_object
+
+
+class JsonFieldStream:
+    """Incremental parser that reports object fields as soon as each one is complete
+
+    feed() takes the next piece of model output and returns (path, value)
+    pairs for fields finished inside it, e.g. (("job_title",), "Data
+    Analyst") or (("learning_roadmap", "immediate"), [...]), down to
+    `max_depth` keys. Array items aren't reported on their own, only the
+    whole array. Anything before the first '{' or after its closing '}' is
+    ignored, like the find/rfind parsing it replaces. Each character is
+    scanned once, so a whole response costs O(n) however it's split.
+    """
+
+    def __init__(self, max_depth: int = 2):
+        self.max_depth = max_depth
+        self.value: Optional[dict] = None
+        self._text = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._string_start: Optional[int] = None
+        self._escape = False
+        self._primitive_start: Optional[int] = None
+        self._started = False
+
+    @property
+    def done(self) -> bool:
+        return self.value is not None
+
+    def feed(self, chunk: str) -> List[Tuple[Tuple[Any, ...], Any]]:
+        if self.done:
+            return []
+        if not self._started:
+            start = chunk.find("{")
+            if start == -1:
+                return []
+            chunk = chunk[start:]
+            self._started = True
+        self._text += chunk
+        events = []
+        text = self._text
+        i = self._pos
+        while i < len(text) and not self.done:
+            char = text[i]
+            if self._string_start is not None:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._end_string(i + 1, events)
+                i += 1
+                continue
+            if self._primitive_start is not None:
+                if char not in _PRIMITIVE_END:
+                    i += 1
+                    continue
+                self._complete(self._primitive_start, i, events)
+                self._primitive_start = None
+            if char in _WHITESPACE:
+                pass
+            elif char == '"':
+                self._string_start = i
+            elif char in "{[":
+                self._stack.append(_Frame(char == "{", i))
+            elif char in "}]":
+                frame = self._stack.pop()
+                if not self._stack:
+                    self.value = json.loads(text[frame.start:i + 1])
+                else:
+                    self._complete(frame.start, i + 1, events)
+            elif char == ":":
+                self._stack[-1].expect_key = False
+            elif char == ",":
+                frame = self._stack[-1]
+                if frame.is_object:
+                    frame.expect_key = True
+                else:
+                    frame.key += 1
+            else:
+                self._primitive_start = i
+            i += 1
+        self._pos = i
+        return events
+
+    def _end_string(self, end: int, events):
+        start, self._string_start = self._string_start, None
+        frame = self._stack[-1]
+        if frame.is_object and frame.expect_key:
+            frame.key = json.loads(self._text[start:end])
+        else:
+            self._complete(start, end, events)
+
+    def _complete(self, start: int, end: int, events):
+        """A value inside the innermost open container just ended"""
+        if not self._stack[-1].is_object or len(self._stack) > self.max_depth:
+            return
+        path = tuple(frame.key for frame in self._stack)
+        events.append((path, json.loads(self._text[start:end])))
@@ -0,0 +1,133 @@
+import os
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+from groq import AsyncGroq, APITimeoutError
+from dotenv import main
+main.load_dotenv()
+
+
+logger = logging.getLogger(__name__)
+
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+
+# Pool / limits (override through .env)
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "20"))
+# never more in flight than the pool has connections, or the excess just
+# queues inside httpx where it can't be bounded
+LLM_MAX_CONCURRENCY = min(
+    int(os.getenv("LLM_MAX_CONCURRENCY", str(LLM_MAX_CONNECTIONS))), LLM_MAX_CONNECTIONS
+)
+# per attempt; each of the LLM_MAX_RETRIES retries gets a fresh one
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+
+
+class LLMTimeoutError(Exception):
+    """Raised when a completion does not finish within its timeout"""
+
+
+_client: Optional[AsyncGroq] = None
+_http_client: Optional[httpx.AsyncClient] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def get_client() -> AsyncGroq:
+    """Shared AsyncGroq client backed by one bounded httpx pool"""
+    global _client, _http_client
+    if _client is None:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_KEEPALIVE
+            ),
+            timeout=httpx.Timeout(LLM_TIMEOUT, connect=5.0)
+        )
+        _client = AsyncGroq(
+            api_key=GROQ_API_KEY,
+            http_client=_http_client,
+            max_retries=LLM_MAX_RETRIES
+        )
+    return _client
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    # created lazily so it binds to the running loop
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return _semaphore
+
+
+async def chat_completion(
+    messages: List[Dict[str, str]],
+    model: str,
+    temperature: float = 0.3,
+    max_tokens: int = 1000,
+    timeout: Optional[float] = None
+) -> str:
+    """Run one chat completion and return the stripped message text"""
+    timeout = timeout or LLM_TIMEOUT
+    async with _get_semaphore():
+        try:
+            # the client applies `timeout` to each attempt, so retries still fit
+            completion = await get_client().chat.completions.create(
+                messages=messages,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=timeout
+            )
+        except APITimeoutError:
+            raise LLMTimeoutError(f"LLM call to {model} timed out after {timeout}s")
+
+    return completion.choices[0].message.content.strip()
+
+
+async def stream_chat_completion(
+    messages: List[Dict[str, str]],
+    model: str,
+    temperature: float = 0.3,
+    max_tokens: int = 1000,
+    timeout: Optional[float] = None
+) -> AsyncIterator[str]:
+    """Yield the completion text as it's generated; `timeout` caps the gap between chunks"""
+    timeout = timeout or LLM_TIMEOUT
+    stream = None
+    async with _get_semaphore():
+        try:
+            stream = await get_client().chat.completions.create(
+                messages=messages,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=timeout,
+                stream=True
+            )
+            chunks = stream.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=timeout)
+                except StopAsyncIteration:
+                    break
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except (asyncio.TimeoutError, APITimeoutError):
+            raise LLMTimeoutError(f"LLM stream from {model} stalled for {timeout}s")
+        finally:
+            # also runs when the consumer stops early, frees the connection
+            if stream is not None:
+                await stream.close()
+
+
+async def close_client():
+    """Close the shared pool (call on app shutdown)"""
+    global _client, _http_client, _semaphore
+    if _http_client is not None:
+        await _http_client.aclose()
+    _client = None
+    _http_client = None
+    _semaphore = None
@@ -0,0 +1,159 @@
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+import llm_router
+
+
+logger = logging.getLogger(__name__)
+
+_CLOSERS = {"{": "}", "[": "]"}
+MAX_START_ATTEMPTS = 3
+
+
+def extract_json(text: str) -> Optional[Any]:
+    """First JSON object in model output, or None
+
+    One pass over the text that tolerates what models actually send:
+    prose around the JSON (including braces after it), ```json fences,
+    trailing commas, and output cut off by max_tokens. A truncated object
+    is closed where it stopped; if the last value was cut mid-token, it
+    falls back to the last complete value instead.
+    """
+    text = text or ""
+    start = text.find("{")
+    # prose like "[note]" before the object: try the next '{', a few times at most
+    for _ in range(MAX_START_ATTEMPTS):
+        if start == -1:
+            return None
+        value = _extract_from(text, start)
+        if value is not None:
+            return value
+        start = text.find("{", start + 1)
+    return None
+
+
+def _extract_from(text: str, start: int) -> Optional[Any]:
+    out: List[str] = []
+    stack: List[str] = []
+    # (length of out, closers needed) after each complete value in a container
+    safe: Optional[Tuple[int, str]] = None
+    in_string = escape = False
+
+    for char in text[start:]:
+        if in_string:
+            out.append(char)
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append(_CLOSERS[char])
+        elif char in "}]":
+            _drop_trailing_comma(out)
+            if not stack or char != stack[-1]:
+                break
+            stack.pop()
+            out.append(char)
+            if not stack:
+                return _loads("".join(out))
+            safe = (len(out), "".join(reversed(stack)))
+            continue
+        elif char == ",":
+            _drop_trailing_comma(out)
+            safe = (len(out), "".join(reversed(stack)))
+        elif char == "`":
+            # a closing fence before the JSON closed: treat as truncated
+            break
+        out.append(char)
+
+    # truncated: close what's open, else go back to the last complete value
+    tail = list(out)
+    if in_string:
+        if escape:
+            tail.pop()
+        tail.append('"')
+    while tail and (tail[-1].isspace() or tail[-1] in ",:"):
+        tail.pop()
+    value = _loads("".join(tail) + "".join(reversed(stack)))
+    if value is None and safe is not None:
+        value = _loads("".join(out[:safe[0]]) + safe[1])
+    return value
+
+
+def _drop_trailing_comma(out: List[str]):
+    i = len(out) - 1
+    while i >= 0 and out[i].isspace():
+        i -= 1
+    if i >= 0 and out[i] == ",":
+        del out[i:]
+
+
+def _loads(text: str) -> Optional[Any]:
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+def validate(data: Any, schema: Type[BaseModel]) -> Tuple[Optional[dict], List[str]]:
+    """(validated dict, []) or (None, names of the missing/invalid top-level fields)"""
+    if not isinstance(data, dict):
+        return None, list(schema.model_fields)
+    try:
+        return schema.model_validate(data).model_dump(), []
+    except ValidationError as e:
+        fields = []
+        for error in e.errors():
+            field = str(error["loc"][0]) if error["loc"] else ""
+            if field and field not in fields:
+                fields.append(field)
+        return None, fields or list(schema.model_fields)
+
+
+def _field_schema(schema: Type[BaseModel], fields: List[str]) -> str:
+    properties = schema.model_json_schema().get("properties", {})
+    return json.dumps({field: properties.get(field, {}) for field in fields})
+
+
+async def parse(text: str, schema: Type[BaseModel], messages: List[Dict[str, str]],
+                task: str = "repair") -> dict:
+    """Model output -> validated dict, asking again only for the fields that are missing
+
+    `messages` is the conversation that produced `text`; the follow-up asks
+    for just the broken fields (small output, small model when the prompt
+    allows) and merges them in. Raises ValueError if it still doesn't fit.
+    """
+    data = extract_json(text)
+    result, fields = validate(data, schema)
+    if result is not None:
+        return result
+
+    logger.warning(f"{schema.__name__} missing/invalid fields {fields}, asking for just those")
+    repair_messages = messages + [
+        {"role": "assistant", "content": text},
+        {
+            "role": "user",
+            "content": (
+                f"Your answer is missing or has invalid values for: {', '.join(fields)}. "
+                f"Respond ONLY with a JSON object containing just these fields, "
+                f"matching this JSON schema: {_field_schema(schema, fields)}"
+            )
+        }
+    ]
+    patch = extract_json(await llm_router.complete(task, repair_messages, temperature=0.1))
+    if not isinstance(patch, dict):
+        raise ValueError(f"Repair for {schema.__name__} returned no JSON object")
+    merged = dict(data) if isinstance(data, dict) else {}
+    merged.update({field: patch[field] for field in fields if field in patch})
+    result, fields = validate(merged, schema)
+    if result is None:
+        raise ValueError(f"{schema.__name__} still invalid after repair: {fields}")
+    return result
@@ -0,0 +1,198 @@
+import os
+import re
+import time
+import logging
+from collections import defaultdict, deque
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional
+
+from llm_client import chat_completion, stream_chat_completion
+
+
+logger = logging.getLogger(__name__)
+
+# Model tiers (override through .env)
+SMALL_MODEL = os.getenv("LLM_SMALL_MODEL", "llama-3.1-8b-instant")
+LARGE_MODEL = os.getenv("LLM_LARGE_MODEL", "mixtral-8x7b-32768")
+# prompts up to this many tokens may go to the small model
+SMALL_PROMPT_TOKENS = int(os.getenv("LLM_SMALL_PROMPT_TOKENS", "600"))
+# latencies kept per task/model for the percentiles
+LATENCY_WINDOW = 1000
+
+# ~4 characters per token for English text/JSON, close enough for budgeting
+CHARS_PER_TOKEN = 4
+# per-message framing (role, separators) the chat format adds
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class TaskPolicy(NamedTuple):
+    small_tier: bool      # short prompts may use the small model
+    max_tokens: int       # output budget
+    max_input_tokens: int # budget for user-supplied text, see fit_text
+
+
+TASKS = {
+    # skills + location in, small fixed JSON out
+    "recommendation": TaskPolicy(True, 400, 1500),
+    "career_advice": TaskPolicy(True, 400, 1500),
+    "roadmap": TaskPolicy(True, 300, 1000),
+    # free-form resume text, the large model earns its keep here
+    "resume": TaskPolicy(False, 1200, 6000),
+    # follow-up asking for just the fields a previous answer got wrong
+    "repair": TaskPolicy(True, 300, 1500),
+}
+
+
+class Route(NamedTuple):
+    task: str
+    model: str
+    max_tokens: int
+    prompt_tokens: int
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text or "") // CHARS_PER_TOKEN)
+
+
+def estimate_message_tokens(messages: List[Dict[str, str]]) -> int:
+    return sum(estimate_tokens(m.get("content", "")) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+_SPACES_RE = re.compile(r"[ \t\u00a0]+")
+
+
+def fit_text(text: str, max_tokens: int) -> str:
+    """Squeeze text into roughly max_tokens
+
+    Whitespace runs and repeated lines (page headers/footers from PDF
+    extraction) go first; if that's not enough the tail is cut at a line
+    break, since resumes put what matters most on top.
+    """
+    text = text or ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    lines, seen = [], set()
+    for line in _BLANK_LINES_RE.sub("\n", text).split("\n"):
+        line = _SPACES_RE.sub(" ", line).strip()
+        key = line.casefold()
+        if line and (key not in seen or len(line) < 4):
+            seen.add(key)
+            lines.append(line)
+    text = "\n".join(lines)
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text.rfind("\n", 0, limit)
+    return text[:cut if cut > limit // 2 else limit] + "\n[truncated]"
+
+
+def input_budget(task: str) -> int:
+    return TASKS[task].max_input_tokens
+
+
+def route(task: str, messages: List[Dict[str, str]]) -> Route:
+    """Model and output budget for a task, from its policy and the prompt size"""
+    policy = TASKS[task]
+    prompt_tokens = estimate_message_tokens(messages)
+    small = policy.small_tier and prompt_tokens <= SMALL_PROMPT_TOKENS
+    picked = Route(task, SMALL_MODEL if small else LARGE_MODEL, policy.max_tokens, prompt_tokens)
+    logger.debug(f"{task}: ~{prompt_tokens} prompt tokens -> {picked.model}, max_tokens={picked.max_tokens}")
+    return picked
+
+
+def _percentile_ms(latencies: List[float], q: float) -> Optional[float]:
+    if not latencies:
+        return None
+    return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 1)
+
+
+class LLMStats:
+    """Per task/model call counts, estimated tokens and latency percentiles"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self._stats = defaultdict(lambda: {
+            "calls": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0,
+            "latencies": deque(maxlen=self.window)
+        })
+
+    def record(self, route: Route, latency: float, completion: str = "", ok: bool = True):
+        entry = self._stats[(route.task, route.model)]
+        entry["calls"] += 1
+        entry["errors"] += 0 if ok else 1
+        entry["prompt_tokens"] += route.prompt_tokens
+        entry["completion_tokens"] += estimate_tokens(completion)
+        entry["latencies"].append(latency)
+
+    def snapshot(self) -> List[dict]:
+        rows = []
+        for (task, model), entry in sorted(self._stats.items()):
+            latencies = sorted(entry["latencies"])
+            rows.append({
+                "task": task,
+                "model": model,
+                "calls": entry["calls"],
+                "errors": entry["errors"],
+                "prompt_tokens_est": entry["prompt_tokens"],
+                "completion_tokens_est": entry["completion_tokens"],
+                "p50_ms": _percentile_ms(latencies, 0.5),
+                "p95_ms": _percentile_ms(latencies, 0.95),
+                "max_ms": _percentile_ms(latencies, 1.0),
+            })
+        return rows
+
+    def clear(self):
+        self._stats.clear()
+
+
+stats = LLMStats()
+
+
+async def complete(task: str, messages: List[Dict[str, str]], temperature: float = 0.3,
+                   timeout: Optional[float] = None) -> str:
+    """chat_completion with the model and max_tokens picked for `task`"""
+    picked = route(task, messages)
+    start = time.perf_counter()
+    try:
+        text = await chat_completion(
+            messages=messages,
+            model=picked.model,
+            temperature=temperature,
+            max_tokens=picked.max_tokens,
+            timeout=timeout
+        )
+    except Exception:
+        stats.record(picked, time.perf_counter() - start, ok=False)
+        raise
+    stats.record(picked, time.perf_counter() - start, text)
+    return text
+
+
+async def stream(task: str, messages: List[Dict[str, str]], temperature: float = 0.3,
+                 timeout: Optional[float] = None) -> AsyncIterator[str]:
+    """stream_chat_completion counterpart of complete()"""
+    picked = route(task, messages)
+    start = time.perf_counter()
+    pieces = []
+    ok = False
+    try:
+        # aclosing: when we're closed early the inner stream (and its semaphore
+        # slot) is released now, not whenever the loop finalizes it
+        async with aclosing(stream_chat_completion(
+            messages=messages,
+            model=picked.model,
+            temperature=temperature,
+            max_tokens=picked.max_tokens,
+            timeout=timeout
+        )) as inner:
+            async for piece in inner:
+                pieces.append(piece)
+                yield piece
+        ok = True
+    except GeneratorExit:
+        # consumer stopped early (got what it needed), not a failure
+        ok = True
+        raise
+    finally:
+        stats.record(picked, time.perf_counter() - start, "".join(pieces), ok=ok)
@@ -2,16 +2,29 @@ from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Query
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Union
 import sqlite3
 import uvicorn
 import os
-from datetime import datetime
-import PyPDF2
-from groq import Groq
 import json
-from read_resume import read_resume_with_groq, extract_skills
+import uuid
+import asyncio
+from llm_client import close_client
+from json_stream import JsonFieldStream
+from cache import recommendation_cache, recommendation_key, resume_cache, normalize_skills
+from singleflight import SingleFlight
+from pdf_ingest import UPLOAD_DIR, save_upload, shutdown_pool
+from starlette.concurrency import run_in_threadpool
+import analyzer_service
+import geo
+import job_search
+import resources
+import llm_router
+import llm_json
+import db
+import job_queue
 from dotenv import main
 import logging
 
@@ -29,7 +42,21 @@ logger = logging.getLogger(__name__)
 app = FastAPI()
 
 
-groq_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+@app.on_event("startup")
+async def load_models():
+    # keep the wrangled datasets + analyzer resident for /recommendations/local
+    await run_in_threadpool(analyzer_service.load_analyzer)
+    await run_in_threadpool(geo.load_geo_index)
+    # needs both of the above: jobs_df and location normalization
+    await run_in_threadpool(job_search.load_index)
+    job_queue.start_workers()
+
+@app.on_event("shutdown")
+async def shutdown_resources():
+    await run_in_threadpool(job_queue.stop_workers)
+    await close_client()
+    shutdown_pool()
+    db.close()
 
 # COOOOOOOOOOOOOOOORS
 app.add_middleware(
@@ -40,41 +67,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# DB Hell
-def init_db():
-    conn = sqlite3.connect('career_advisor.db')
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT UNIQUE,
-            created_at TIMESTAMP
-        )
-    ''')
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS user_profiles (
-            user_id INTEGER,
-            skills TEXT,
-            location TEXT,
-            resume_path TEXT,
-            last_updated TIMESTAMP,
-            FOREIGN KEY(user_id) REFERENCES users(id)
-        )
-    ''')
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS career_recommendations (
-            user_id INTEGER,
-            recommended_job TEXT,
-            confidence_score FLOAT,
-            created_at TIMESTAMP,
-            FOREIGN KEY(user_id) REFERENCES users(id)
-        )
-    ''')
-    conn.commit()
-    conn.close()
-
-
-init_db()
+db.init_db()
 
 # I think this is pydantic stuff
 class UserBase(BaseModel):
@@ -91,20 +84,19 @@ class CareerRecommendation(BaseModel):
     required_skills: List[str]
     learning_roadmap: dict
 
+class LearningRoadmap(BaseModel):
+    immediate: List[str]
+    short_term: List[str]
+    long_term: List[str]
 
-class DBConnection:
-    def __init__(self):
-        self.conn = sqlite3.connect('career_advisor.db')
-        self.conn.row_factory = sqlite3.Row
-
-    def __enter__(self):
-        return self.conn
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.conn.close()
 
-def get_career_advice_from_groq(skills: List[str], location: str) -> dict:
+async def get_career_advice_from_groq(skills: List[str], location: str) -> dict:
     """Get career recommendations using Groq"""
+    cache_key = recommendation_key("career_advice", skills, location)
+    cached = await recommendation_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     prompt = f"""
     Given these skills: {', '.join(skills)}
     And location: {location}
@@ -127,51 +119,71 @@ def get_career_advice_from_groq(skills: List[str], location: str) -> dict:
     }}
     """
     
+    messages = [{
+        "role": "system",
+        "content": """You are a career advisor specializing in tech careers with 
+        multiple years of experience. Always return valid JSON."""
+    }, {
+        "role": "user",
+        "content": prompt
+    }]
     try:
-        completion = groq_client.chat.completions.create(
-            messages=[{
-                "role": "system",
-                "content": """You are a career advisor specializing in tech careers with 
-                multiple years of experience. Always return valid JSON."""
-            }, {
-                "role": "user",
-                "content": prompt
-            }],
-            model="mixtral-8x7b-32768",
-            temperature=0.3,
-            max_tokens=2000
-        )
+        response_text = await llm_router.complete("career_advice", messages=messages, temperature=0.3)
         
-        return json.loads(completion.choices[0].message.content.strip())
+        advice = await llm_json.parse(response_text, CareerRecommendation, messages)
+        await recommendation_cache.set(cache_key, advice)
+        return advice
     except Exception as e:
         print(f"Groq API error: {str(e)}")
         return None
 
+async def get_roadmap_from_groq(job_title: str, skills: List[str],
+                                target_skills: List[str]) -> Optional[dict]:
+    """Roadmap text only; job matching already happened locally"""
+    cache_key = recommendation_key(f"roadmap:{job_title.casefold()}", skills + ["->"] + target_skills, "")
+    cached = await recommendation_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    prompt = f"""
+    Target role: {job_title}
+    Current skills: {', '.join(skills)}
+    Skills the role needs: {', '.join(target_skills)}
+    
+    Build a 2 month learning roadmap for the missing skills. Respond ONLY with JSON:
+    {{"immediate": ["..."], "short_term": ["..."], "long_term": ["..."]}}
+    """
+    messages = [{
+        "role": "system",
+        "content": "You are a career advisor. Always return valid JSON."
+    }, {
+        "role": "user",
+        "content": prompt
+    }]
+    try:
+        response_text = await llm_router.complete("roadmap", messages=messages, temperature=0.3)
+        roadmap = await llm_json.parse(response_text, LearningRoadmap, messages)
+        await recommendation_cache.set(cache_key, roadmap)
+        return roadmap
+    except Exception as e:
+        logger.error(f"Roadmap generation failed: {e}")
+        return None
+
 # User has been created
 @app.post("/users/", response_model=UserBase)
 async def create_user(user: UserBase):
-    with DBConnection() as conn:
-        c = conn.cursor()
-        try:
-            c.execute(
-                "INSERT INTO users (email, created_at) VALUES (?, ?)",
-                (user.email, datetime.now())
-            )
-            conn.commit()
-            
-            # Get the created user's ID
-            c.execute("SELECT id FROM users WHERE email = ?", (user.email,))
-            user_id = c.fetchone()['id']
-            
-            return {
-                "email": user.email,
-                "id": user_id
-            }
-        except sqlite3.IntegrityError:
-            raise HTTPException(
-                status_code=400, 
-                detail="Email already registered"
-            )
+    try:
+        user_id = await db.create_user(user.email)
+        
+        return {
+            "email": user.email,
+            "id": user_id
+        }
+    except sqlite3.IntegrityError:
+        raise HTTPException(
+            status_code=400, 
+            detail="Email already registered"
+        )
 
 # User has been updated
 @app.post("/profile/{user_id}")
@@ -182,92 +194,87 @@ async def update_profile(
 ):
     try:
         profile_data = UserProfile(**json.loads(profile))
+        profile_data.location = geo.normalize_location(profile_data.location)
         
-        with DBConnection() as conn:
-            c = conn.cursor()
-            
-            resume_path = None
-            resume_skills = []
-            if resume:
-                file_path = f"uploads/{user_id}_{resume.filename}"
-                os.makedirs("uploads", exist_ok=True)
-                with open(file_path, "wb") as buffer:
-                    content = await resume.read()
-                    buffer.write(content)
-                resume_path = file_path
-                
-                # WORK YOU STUPID THING
-                with open(file_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    text = ""
-                    for page in pdf_reader.pages:
-                        text += page.extract_text()
-                
-                resume_analysis = read_resume_with_groq(text)
-                if resume_analysis:
-                    resume_skills = extract_skills(resume_analysis)
-                    profile_data.skills.extend(resume_skills)
-            
-            # profile_data.skills = list(set(profile_data.skills))
-            c.execute("""
-                INSERT OR REPLACE INTO user_profiles 
-                (user_id, skills, location, resume_path, last_updated)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                user_id,
-                ",".join(set(profile_data.skills)),
-                profile_data.location,
-                resume_path,
-                datetime.now()
-            ))
-            conn.commit()
-            
+        resume_path = None
+        content_hash = None
+        if resume:
+            # streamed to disk in chunks, hashed on the way
+            upload_path = os.path.join(UPLOAD_DIR, f"{user_id}_{uuid.uuid4().hex}.part")
+            content_hash, _ = await save_upload(resume, upload_path)
+            # stored by content, so a queued job always reads the bytes its hash came from
+            resume_path = os.path.join(UPLOAD_DIR, f"{content_hash}.pdf")
+            await run_in_threadpool(os.replace, upload_path, resume_path)
+        
+        # the profile is usable right away, resume skills are added by the job
+        await db.upsert_profile(
+            user_id,
+            profile_data.skills,
+            profile_data.location,
+            resume_path
+        )
+        if not resume_path:
             return {
                 "message": "Profile updated successfully",
-                "skills_extracted": len(resume_skills)
+                "skills_extracted": 0
             }
+        
+        # PDF parsing + analysis happen in the job workers, poll /jobs/{job_id}
+        job_id = await job_queue.enqueue("resume", {
+            "user_id": user_id,
+            "skills": profile_data.skills,
+            "location": profile_data.location,
+            "resume_path": resume_path,
+            "content_hash": content_hash
+        })
+        return {
+            "message": "Profile updated, resume is being processed",
+            "job_id": job_id,
+            "status_url": f"/jobs/{job_id}"
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """Status/stage of a background job, with its result once done"""
+    job = await job_queue.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
 # Recommendations from model and groqq
 @app.get("/recommendations/{user_id}", response_model=CareerRecommendation)
 async def get_career_recommendations(user_id: int):
     try:
-        with DBConnection() as conn:
-            c = conn.cursor()
-            c.execute("""SELECT skills, location 
-                      FROM user_profiles 
-                      WHERE user_id = ?""", (user_id,))
-            profile = c.fetchone()
-            
-            if not profile:
-                raise HTTPException(status_code=404, detail="Profile not found")
-            
-            skills = profile['skills'].split(',')
-            
-            recommendations = get_career_advice_from_groq(skills, profile['location'])
-            
-            if not recommendations:
-                raise HTTPException(
-                    status_code=500,
-                    detail="Could not generate recommendations"
-                )
-            
-            # Do I really need to add it to the db
-            c.execute("""
-                INSERT INTO career_recommendations 
-                (user_id, recommended_job, confidence_score, created_at)
-                VALUES (?, ?, ?, ?)
-            """, (
-                user_id,
-                recommendations['job_title'],
-                recommendations['confidence_score'],
-                datetime.now()
-            ))
-            conn.commit()
-            
-            return CareerRecommendation(**recommendations)
+        profile = await db.get_profile(user_id)
+        
+        if not profile:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        
+        skills = profile['skills'].split(',')
+        
+        recommendations = await get_career_advice_from_groq(skills, profile['location'])
+        
+        if not recommendations:
+            raise HTTPException(
+                status_code=500,
+                detail="Could not generate recommendations"
+            )
+        
+        # Do I really need to add it to the db
+        await db.add_recommendation(
+            user_id,
+            recommendations['job_title'],
+            recommendations['confidence_score']
+        )
+        
+        return CareerRecommendation(**recommendations)
             
+    except HTTPException:
+        raise
     # pls work
     except Exception as e:
         raise HTTPException(
@@ -275,6 +282,88 @@ async def get_career_recommendations(user_id: int):
             detail=f"Error generating recommendations: {str(e)}"
         )
 
+@app.get("/skills/{skill}/users")
+async def get_users_with_skill(skill: str):
+    return {"skill": skill, "user_ids": await db.users_with_skill(skill)}
+
+# Batch limits (override through .env)
+MAX_BATCH_ITEMS = int(os.getenv("MAX_BATCH_ITEMS", "5000"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "16"))
+
+recommendation_flight = SingleFlight()
+
+def _recommendation_messages(skills: List[str], location: str) -> List[dict]:
+    # Career analysis prompt; courses and jobs come from our own catalog/index
+    career_prompt = """
+    Based on these skills: {skills} and location: {location}, provide a career recommendation.
+
+    Respond with ONLY a JSON object in this EXACT format, no additional text or explanation:
+    {{
+        "job_title": "Best matching job title",
+        "confidence_score": 0.85,
+        "required_skills": ["skill1", "skill2", "skill3", "skill4", "skill5"],
+        "learning_roadmap": {{
+            "immediate": ["skill1", "skill2"],
+            "short_term": ["skill3", "skill4"],
+            "long_term": ["skill5", "skill6"]
+        }}
+    }}
+    """.format(skills=", ".join(skills), location=location)
+
+    return [
+        {
+            "role": "system",
+            "content": "You are a career advisor. Respond only with the requested JSON format. No additional text."
+        },
+        {
+            "role": "user",
+            "content": career_prompt
+        }
+    ]
+
+async def _fetch_recommendation(skills: List[str], location: str, cache_key: str) -> dict:
+    """LLM answer for a recommendation, parsed (and patched if needed) and cached"""
+    messages = _recommendation_messages(skills, location)
+    career_text = await llm_router.complete("recommendation", messages=messages, temperature=0.7)
+    logger.info(f"Raw career response: {career_text}")
+
+    # tolerant of fences/trailing text, re-asks only for fields that are missing
+    career_data = await llm_json.parse(career_text, CareerRecommendation, messages)
+    logger.info("Successfully parsed career data")
+    await recommendation_cache.set(cache_key, career_data)
+    return career_data
+
+async def build_recommendation(skills: List[str], location: str) -> dict:
+    """Career recommendation plus learning resources for one skills/location pair"""
+    # Same normalized skills + location -> same answer
+    cache_key = recommendation_key("recommendations", skills, location)
+    career_data = await recommendation_cache.get(cache_key)
+    if career_data is None:
+        # concurrent callers with the same key share one upstream call
+        career_data = await recommendation_flight.do(
+            cache_key, _fetch_recommendation, skills, location, cache_key
+        )
+    else:
+        logger.info("Recommendation cache hit")
+    return _finish_recommendation(career_data, location)
+
+def _finish_recommendation(career_data: dict, location: str) -> dict:
+    """Parsed LLM answer -> response, with catalog resources and local job postings"""
+    job_title = career_data["job_title"]
+    required_skills = career_data["required_skills"]
+    response_data = {
+        "job_title": job_title,
+        "confidence_score": career_data["confidence_score"],
+        "required_skills": required_skills,
+        "learning_roadmap": career_data["learning_roadmap"],
+        "learning_resources": resources.learning_resources(job_title, required_skills),
+        # live postings from the local index, not invented by the model
+        "relevant_jobs": job_search.relevant_jobs(job_title, required_skills, location)
+    }
+
+    logger.info("Successfully prepared final response with learning resources")
+    return response_data
+
 @app.post("/recommendations/")
 async def get_recommendations(
     email: str = Form(...),
@@ -288,319 +377,16 @@ async def get_recommendations(
     try:
         logger.info(f"Processing request for {email} with skills: {skills}")
 
+        # "sf 94105" and "San Francisco, CA" share a prompt and a cache entry
+        location = geo.normalize_location(location)
+
         # Process resume if provided
         # ... (keep existing resume processing code)
 
-        # Career analysis prompt
-        career_prompt = """
-        Based on these skills: {skills} and location: {location}, provide a career recommendation.
-        
-        Respond with ONLY a JSON object in this EXACT format, no additional text or explanation:
-        {{
-            "job_title": "Best matching job title",
-            "confidence_score": 0.85,
-            "required_skills": ["skill1", "skill2", "skill3", "skill4", "skill5"],
-            "learning_roadmap": {{
-                "immediate": ["skill1", "skill2"],
-                "short_term": ["skill3", "skill4"],
-                "long_term": ["skill5", "skill6"]
-            }},
-            "learning_resources": {{
-                "courses": [
-                    {{
-                        "title": "Complete Python Developer Course",
-                        "platform": "Udemy",
-                        "link": "https://www.udemy.com/course/complete-python-developer",
-                        "price": "$12.99",
-                        "rating": 4.8,
-                        "skill": "Python"
-                    }},
-                    {{
-                        "title": "React - The Complete Guide",
-                        "platform": "Coursera",
-                        "link": "https://www.coursera.org/learn/react-complete-guide",
-                        "price": "$49.99",
-                        "rating": 4.7,
-                        "skill": "React"
-                    }}
-                ],
-                "additional_resources": [
-                    {{
-                        "title": "MDN Web Docs",
-                        "type": "Documentation",
-                        "link": "https://developer.mozilla.org",
-                        "description": "Comprehensive web development documentation"
-                    }},
-                    {{
-                        "title": "freeCodeCamp",
-                        "type": "Interactive Learning",
-                        "link": "https://www.freecodecamp.org",
-                        "description": "Free coding tutorials and certifications"
-                    }}
-                ]
-            }},
-            "relevant_jobs": [
-                {{
-                    "title": "Senior Software Engineer",
-                    "company": "Example Corp",
-                    "location": "Remote",
-                    "salary": "$120,000 - $150,000",
-                    "skills": ["Python", "JavaScript", "AWS"],
-                    "link": "https://example.com/jobs/123"
-                }},
-                {{
-                    "title": "Software Developer",
-                    "company": "Tech Solutions Inc",
-                    "location": "New York, NY",
-                    "salary": "$90,000 - $120,000",
-                    "skills": ["React", "Node.js", "SQL"],
-                    "link": "https://example.com/jobs/456"
-                }}
-            ]
-        }}
-        """.format(skills=skills, location=location)
-
-        # Get career recommendation
-        career_response = groq_client.chat.completions.create(
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a career advisor. Respond only with the requested JSON format, including job listings. No additional text."
-                },
-                {
-                    "role": "user",
-                    "content": career_prompt
-                }
-            ],
-            model="mixtral-8x7b-32768",
-            temperature=0.7,
-            max_tokens=1000
-        )
-
-        # Clean and parse career response
-        career_text = career_response.choices[0].message.content.strip()
-        logger.info(f"Raw career response: {career_text}")
-
-        # Find the JSON object in the response
         try:
-            start_idx = career_text.find('{')
-            end_idx = career_text.rfind('}') + 1
-            if start_idx == -1 or end_idx == 0:
-                raise ValueError("No JSON object found in response")
-            
-            career_json = career_text[start_idx:end_idx]
-            career_data = json.loads(career_json)
-            logger.info("Successfully parsed career data")
-            
-            # After parsing career_data, ensure learning resources exist
-            if not career_data.get('learning_resources'):
-                # Create learning resources based on the required skills
-                skills_courses = []
-                for skill in career_data.get('required_skills', [])[:2]:  # Get first two skills
-                    if skill.lower() == 'python':
-                        skills_courses.append({
-                            "title": "Complete Python Bootcamp",
-                            "platform": "Udemy",
-                            "link": "https://www.udemy.com/course/complete-python-bootcamp/",
-                            "price": "$12.99",
-                            "rating": 4.8,
-                            "skill": "Python"
-                        })
-                    elif 'javascript' in skill.lower():
-                        skills_courses.append({
-                            "title": "Modern JavaScript from the Beginning",
-                            "platform": "Udemy",
-                            "link": "https://www.udemy.com/course/modern-javascript/",
-                            "price": "$14.99",
-                            "rating": 4.7,
-                            "skill": "JavaScript"
-                        })
-                    else:
-                        skills_courses.append({
-                            "title": f"Complete {skill} Course",
-                            "platform": "Coursera",
-                            "link": "https://www.coursera.org",
-                            "price": "$49.99",
-                            "rating": 4.6,
-                            "skill": skill
-                        })
-
-                career_data['learning_resources'] = {
-                    "courses": skills_courses,
-                    "additional_resources": [
-                        {
-                            "title": "freeCodeCamp",
-                            "type": "Interactive Learning",
-                            "link": "https://www.freecodecamp.org",
-                            "description": "Free coding tutorials and certifications for web development"
-                        },
-                        {
-                            "title": "MDN Web Docs",
-                            "type": "Documentation",
-                            "link": "https://developer.mozilla.org",
-                            "description": "Comprehensive web development documentation and tutorials"
-                        },
-                        {
-                            "title": "GitHub Learning Lab",
-                            "type": "Interactive Learning",
-                            "link": "https://lab.github.com",
-                            "description": "Learn essential developer tools and workflows"
-                        }
-                    ]
-                }
-
-            # Career-specific resources mapping
-            career_resources_map = {
-                "Web Developer": {
-                    "courses": [
-                        {
-                            "title": "The Complete Web Development Bootcamp 2024",
-                            "platform": "Udemy",
-                            "link": "https://www.udemy.com/course/the-complete-web-development-bootcamp/",
-                            "price": "$13.99",
-                            "rating": 4.8,
-                            "skill": "Web Development",
-                            "difficulty": "Beginner"
-                        },
-                        {
-                            "title": "React - The Complete Guide",
-                            "platform": "Udemy",
-                            "link": "https://www.udemy.com/course/react-the-complete-guide/",
-                            "price": "$12.99",
-                            "rating": 4.7,
-                            "skill": "React",
-                            "difficulty": "Intermediate"
-                        }
-                    ],
-                    "additional_resources": [
-                        {
-                            "title": "MDN Web Docs",
-                            "type": "Documentation",
-                            "link": "https://developer.mozilla.org",
-                            "description": "Comprehensive web development documentation",
-                            "format": "Text"
-                        },
-                        {
-                            "title": "Frontend Masters",
-                            "type": "Video Courses",
-                            "link": "https://frontendmasters.com",
-                            "description": "Advanced frontend development courses",
-                            "format": "Video"
-                        }
-                    ]
-                },
-                "Backend Developer": {
-                    "courses": [
-                        {
-                            "title": "Complete Python Programming Masterclass",
-                            "platform": "Udemy",
-                            "link": "https://www.udemy.com/course/complete-python-bootcamp/",
-                            "price": "$14.99",
-                            "rating": 4.8,
-                            "skill": "Python",
-                            "difficulty": "Beginner"
-                        },
-                        {
-                            "title": "Node.js, Express, MongoDB & More",
-                            "platform": "Udemy",
-                            "link": "https://www.udemy.com/course/nodejs-express-mongodb-bootcamp/",
-                            "price": "$15.99",
-                            "rating": 4.7,
-                            "skill": "Node.js",
-                            "difficulty": "Intermediate"
-                        }
-                    ],
-                    "additional_resources": [
-                        {
-                            "title": "Python Documentation",
-                            "type": "Documentation",
-                            "link": "https://docs.python.org/3/",
-                            "description": "Official Python programming documentation",
-                            "format": "Text"
-                        },
-                        {
-                            "title": "Node.js Documentation",
-                            "type": "Documentation",
-                            "link": "https://nodejs.org/docs/latest/",
-                            "description": "Official Node.js documentation",
-                            "format": "Text"
-                        }
-                    ]
-                }
-            }
-
-            # Default resources if career is not found in mapping
-            default_resources = {
-                "courses": [
-                    {
-                        "title": "Git Complete: The definitive guide",
-                        "platform": "Udemy",
-                        "link": "https://www.udemy.com/course/git-complete/",
-                        "price": "$12.99",
-                        "rating": 4.7,
-                        "skill": "Git",
-                        "difficulty": "Beginner"
-                    },
-                    {
-                        "title": "Data Structures and Algorithms",
-                        "platform": "Coursera",
-                        "link": "https://www.coursera.org/learn/algorithms-part1",
-                        "price": "$49.99",
-                        "rating": 4.8,
-                        "skill": "DSA",
-                        "difficulty": "Intermediate"
-                    }
-                ],
-                "additional_resources": [
-                    {
-                        "title": "GitHub Learning Lab",
-                        "type": "Interactive Tutorial",
-                        "link": "https://lab.github.com",
-                        "description": "Learn essential GitHub workflows",
-                        "format": "Interactive"
-                    },
-                    {
-                        "title": "LeetCode",
-                        "type": "Practice Platform",
-                        "link": "https://leetcode.com",
-                        "description": "Practice coding problems",
-                        "format": "Interactive"
-                    }
-                ]
-            }
-
-            # Get career-specific resources based on job title
-            career_specific_resources = career_resources_map.get(career_data['job_title'])
-            
-            if career_specific_resources:
-                # Combine career-specific resources with default resources
-                combined_resources = {
-                    "courses": career_specific_resources["courses"] + default_resources["courses"],
-                    "additional_resources": career_specific_resources["additional_resources"] + default_resources["additional_resources"]
-                }
-            else:
-                # Use default resources if career not found in mapping
-                combined_resources = default_resources
-
-            # Update career_data with the combined resources
-            career_data['learning_resources'] = combined_resources
-
-            # Prepare final response
-            response_data = {
-                "job_title": career_data["job_title"],
-                "confidence_score": career_data["confidence_score"],
-                "required_skills": career_data["required_skills"],
-                "learning_roadmap": career_data["learning_roadmap"],
-                "learning_resources": career_data["learning_resources"],
-                "relevant_jobs": career_data.get("relevant_jobs", [])
-            }
-
-            logger.info("Successfully prepared final response with learning resources")
-            return response_data
-
-        except Exception as e:
+            return await build_recommendation(skills.split(','), location)
+        except (ValueError, KeyError) as e:
             logger.error(f"Career parsing error: {e}")
-            logger.error(f"Attempted to parse: {career_text}")
             raise HTTPException(status_code=500, detail="Failed to parse career response")
 
     except HTTPException as he:
@@ -609,30 +395,269 @@ async def get_recommendations(
         logger.error(f"Unexpected error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _stream_recommendation(skills: List[str], location: str, cache_key: str,
+                                 fields: asyncio.Queue) -> dict:
+    """_fetch_recommendation over the streaming API; each (path, value) goes on `fields` once complete"""
+    messages = _recommendation_messages(skills, location)
+    parser = JsonFieldStream()
+    text = []
+    stream = llm_router.stream("recommendation", messages=messages, temperature=0.7)
+    try:
+        async for piece in stream:
+            text.append(piece)
+            if parser is None:
+                continue
+            try:
+                for field in parser.feed(piece):
+                    fields.put_nowait(field)
+            except ValueError:
+                # not strict JSON (trailing comma...), llm_json sorts it out at the end
+                parser = None
+                continue
+            if parser.done:
+                # anything after the closing brace is chatter, stop paying for it
+                break
+    finally:
+        # closes the upstream response now rather than whenever the generator is collected
+        await stream.aclose()
+    career_data = await llm_json.parse("".join(text), CareerRecommendation, messages)
+    await recommendation_cache.set(cache_key, career_data)
+    return career_data
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/recommendations/stream")
+async def stream_recommendations(
+    email: str = Form(...),
+    skills: str = Form(...),
+    location: str = Form(...)
+):
+    """/recommendations/ as Server-Sent Events
+
+    A `field` event ({"path": "learning_roadmap.immediate", "value": [...]})
+    goes out as soon as the model has finished writing that field, then one
+    `done` event carries the full response (same shape as /recommendations/),
+    or an `error` event with a detail.
+    """
+    logger.info(f"Streaming request for {email} with skills: {skills}")
+    location = geo.normalize_location(location)
+    skill_list = skills.split(',')
+    cache_key = recommendation_key("recommendations", skill_list, location)
+
+    async def events():
+        try:
+            career_data = await recommendation_cache.get(cache_key)
+            if career_data is None:
+                # shares the single-flight of /recommendations/: only the caller
+                # that started the LLM call sees field events, the rest just `done`
+                fields = asyncio.Queue()
+                flight = asyncio.ensure_future(recommendation_flight.do(
+                    cache_key, _stream_recommendation, skill_list, location, cache_key, fields
+                ))
+                flight.add_done_callback(lambda _: fields.put_nowait(None))
+                try:
+                    while (field := await fields.get()) is not None:
+                        path, value = field
+                        yield _sse("field", {"path": ".".join(map(str, path)), "value": value})
+                    career_data = await flight
+                finally:
+                    # client gone: the shared call keeps going for the others
+                    flight.cancel()
+            else:
+                logger.info("Recommendation cache hit")
+            yield _sse("done", _finish_recommendation(career_data, location))
+        except (ValueError, KeyError) as e:
+            logger.error(f"Career parsing error: {e}")
+            yield _sse("error", {"detail": "Failed to parse career response"})
+        except Exception as e:
+            logger.error(f"Streaming recommendation failed: {e}", exc_info=True)
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # keep proxies from buffering the events
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+class BatchItem(BaseModel):
+    id: Optional[str] = None
+    email: Optional[str] = None
+    # list or the form's comma-separated string
+    skills: Union[List[str], str]
+    location: str = ""
+
+class BatchRequest(BaseModel):
+    items: List[BatchItem]
+
+@app.post("/recommendations/batch")
+async def batch_recommendations(request: BatchRequest):
+    """Recommendations for many profiles, streamed back as NDJSON as they finish
+
+    Items with the same normalized skills + location share one answer, and
+    at most BATCH_CONCURRENCY distinct ones are generated at a time. Each
+    line is {"index", "id", "ok", "result" | "error"}; order is completion order.
+    """
+    if len(request.items) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_ITEMS} items per batch")
+
+    # normalized key -> (skills, location, item indices)
+    groups = {}
+    for i, item in enumerate(request.items):
+        skills = item.skills.split(',') if isinstance(item.skills, str) else item.skills
+        skills = normalize_skills(skills)
+        location = geo.normalize_location(item.location)
+        key = recommendation_key("recommendations", skills, location)
+        groups.setdefault(key, (skills, location, []))[2].append(i)
+    logger.info(f"Batch of {len(request.items)} items, {len(groups)} unique")
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run(skills, location, indices):
+        async with semaphore:
+            try:
+                return indices, await build_recommendation(skills, location), None
+            except (ValueError, KeyError) as e:
+                logger.error(f"Career parsing error: {e}")
+                return indices, None, "Failed to parse career response"
+            except Exception as e:
+                logger.error(f"Batch item failed: {e}")
+                return indices, None, str(e)
+
+    async def lines():
+        tasks = [asyncio.ensure_future(run(*group)) for group in groups.values()]
+        try:
+            for done in asyncio.as_completed(tasks):
+                indices, result, error = await done
+                for i in indices:
+                    line = {"index": i, "id": request.items[i].id, "ok": error is None}
+                    if error is None:
+                        line["result"] = result
+                    else:
+                        line["error"] = error
+                    yield json.dumps(line) + "\n"
+        finally:
+            # client went away: stop the rest (single-flight keeps shared calls alive)
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+# Served from the in-process JobSkillsAnalyzer, Groq only writes the roadmap
+@app.post("/recommendations/local")
+async def get_local_recommendations(
+    skills: str = Form(...),
+    current_job: str = Form(...),
+    target_job: str = Form(""),
+    roadmap: bool = Form(False)
+):
+    if analyzer_service.get_analyzer() is None:
+        raise HTTPException(status_code=503, detail="Career model is not loaded")
+
+    skills_list = [skill.strip() for skill in skills.split(',') if skill.strip()]
+    try:
+        result = await run_in_threadpool(
+            analyzer_service.local_recommendation,
+            current_job, skills_list, target_job or None
+        )
+    except Exception as e:
+        logger.error(f"Local recommendation error: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    result["learning_roadmap"] = None
+    if roadmap:
+        result["learning_roadmap"] = await get_roadmap_from_groq(
+            result["target_job"],
+            skills_list,
+            result["essential_skills"] + result["recommended_skills"]
+        )
+    return result
+
+@app.get("/career-paths")
+async def get_career_paths(
+    from_job: str = Query(...),
+    to_job: str = Query(""),
+    max_hops: int = Query(3, ge=1, le=3),
+    limit: int = Query(10, ge=1, le=50)
+):
+    if analyzer_service.get_analyzer() is None:
+        raise HTTPException(status_code=503, detail="Career model is not loaded")
+
+    # with no destination, list the best next hops instead
+    if not to_job:
+        return {"next_hops": await run_in_threadpool(analyzer_service.next_hops, from_job, limit)}
+
+    # title resolution plus up to 3x3 searches; keep it off the event loop
+    path = await run_in_threadpool(analyzer_service.career_path, from_job, to_job, max_hops)
+    if path is None:
+        raise HTTPException(status_code=404, detail="No career path found")
+    return path
+
+@app.get("/geo/lookup")
+async def geo_lookup(location: str = Query(...)):
+    place = geo.resolve(location)
+    if place is None:
+        raise HTTPException(status_code=404, detail="Location not found")
+    return {**place._asdict(), "label": place.label}
+
+@app.get("/geo/nearby")
+async def geo_nearby(
+    location: str = Query(...),
+    miles: float = Query(25, gt=0, le=500)
+):
+    if geo.resolve(location) is None:
+        raise HTTPException(status_code=404, detail="Location not found")
+    return {"location": geo.normalize_location(location), "nearby": geo.nearby_locations(location, miles)}
+
+@app.get("/model/status")
+async def get_model_status():
+    return analyzer_service.status()
+
+@app.get("/llm/stats")
+async def get_llm_stats():
+    """Per task/model calls, estimated tokens and latency percentiles since startup"""
+    return {
+        "models": {"small": llm_router.SMALL_MODEL, "large": llm_router.LARGE_MODEL},
+        "calls": llm_router.stats.snapshot()
+    }
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    return {
+        "recommendations": recommendation_cache.stats(),
+        "resumes": resume_cache.stats()
+    }
+
 @app.get("/job-openings")
-async def get_job_openings(title: str = Query(...)):
+async def get_job_openings(
+    title: str = Query(""),
+    skills: str = Query(""),
+    location: str = Query(""),
+    miles: float = Query(25, gt=0, le=500),
+    experience: str = Query(""),
+    min_salary: Optional[float] = Query(None, ge=0),
+    max_salary: Optional[float] = Query(None, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None)
+):
+    index = job_search.get_index()
+    if index is None:
+        raise HTTPException(status_code=503, detail="Job search index is not loaded")
     try:
-        # Here you would implement the logic to fetch job openings based on the title
-        # For demonstration, let's return some mock data
-        job_openings = [
-            {
-                "title": f"Senior {title}",
-                "company": "Tech Company A",
-                "location": "Remote",
-                "salary": "$120,000 - $150,000",
-                "skills": ["Python", "Django", "REST APIs"],
-                "link": "https://example.com/job-a"
-            },
-            {
-                "title": f"Junior {title}",
-                "company": "Tech Company B",
-                "location": "New York, NY",
-                "salary": "$80,000 - $100,000",
-                "skills": ["JavaScript", "React"],
-                "link": "https://example.com/job-b"
-            }
-        ]
-        return job_openings
+        return index.search(
+            title=title,
+            skills=skills.split(","),
+            location=location,
+            miles=miles,
+            experience=experience,
+            min_salary=min_salary,
+            max_salary=max_salary,
+            limit=limit,
+            cursor=cursor
+        )
+    except job_search.InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching job openings: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch job openings")
@@ -0,0 +1,134 @@
+import os
+import asyncio
+import hashlib
+import logging
+import threading
+import multiprocessing
+from typing import Tuple
+
+import PyPDF2
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
+UPLOAD_CHUNK_SIZE = 64 * 1024
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "20"))
+PDF_EXTRACT_TIMEOUT = float(os.getenv("PDF_EXTRACT_TIMEOUT", "15"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "2"))
+
+
+class PDFExtractionError(Exception):
+    """Raised when a PDF cannot be parsed within the configured limits"""
+
+
+# One short-lived process per extraction: a hostile PDF that hangs gets its
+# own process killed, nobody else's. The fork server keeps this module (and
+# PyPDF2) imported, so starting one costs a fork, not an interpreter.
+if "forkserver" in multiprocessing.get_all_start_methods():
+    _context = multiprocessing.get_context("forkserver")
+    _context.set_forkserver_preload([__name__])
+else:
+    _context = multiprocessing.get_context("spawn")
+
+_slots = threading.BoundedSemaphore(PDF_WORKERS)
+_running = set()
+_running_lock = threading.Lock()
+
+
+def shutdown_pool():
+    """Kill any extraction still running (app/worker shutdown)"""
+    with _running_lock:
+        processes = list(_running)
+    for process in processes:
+        process.kill()
+
+
+async def save_upload(upload: UploadFile, file_path: str,
+                      max_bytes: int = MAX_UPLOAD_BYTES) -> Tuple[str, int]:
+    """Stream an upload to disk in chunks, returning (sha256 hex, size)"""
+    digest = hashlib.sha256()
+    size = 0
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+
+    buffer = await run_in_threadpool(open, file_path, "wb")
+    try:
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Resume exceeds {max_bytes // (1024 * 1024)} MB limit"
+                )
+            digest.update(chunk)
+            await run_in_threadpool(buffer.write, chunk)
+    except BaseException:
+        buffer.close()
+        os.remove(file_path)
+        raise
+    buffer.close()
+
+    return digest.hexdigest(), size
+
+
+def _extract_text(file_path: str, max_pages: int) -> str:
+    reader = PyPDF2.PdfReader(file_path)
+    parts = []
+    for i, page in enumerate(reader.pages):
+        if i >= max_pages:
+            break
+        parts.append(page.extract_text() or "")
+    return "\n".join(parts)
+
+
+def _extract_worker(sender, file_path: str, max_pages: int):
+    """Runs in the extraction process, answers (ok, text or error message)"""
+    try:
+        sender.send((True, _extract_text(file_path, max_pages)))
+    except Exception as e:
+        sender.send((False, str(e)))
+    finally:
+        sender.close()
+
+
+def _extract_isolated(file_path: str, max_pages: int, timeout: float) -> str:
+    """Blocking: extract in a fresh process, killing just that one on timeout"""
+    with _slots:
+        receiver, sender = _context.Pipe(duplex=False)
+        process = _context.Process(
+            target=_extract_worker, args=(sender, file_path, max_pages), daemon=True
+        )
+        process.start()
+        sender.close()
+        with _running_lock:
+            _running.add(process)
+        try:
+            if not receiver.poll(timeout):
+                logger.warning(f"PDF extraction timed out after {timeout}s: {file_path}")
+                raise PDFExtractionError(f"PDF extraction timed out after {timeout}s")
+            ok, value = receiver.recv()
+        except EOFError:
+            raise PDFExtractionError("PDF worker crashed")
+        finally:
+            if process.is_alive():
+                process.kill()
+            process.join()
+            receiver.close()
+            with _running_lock:
+                _running.discard(process)
+    if not ok:
+        raise PDFExtractionError(f"Could not read PDF: {value}")
+    return value
+
+
+async def extract_text(file_path: str, max_pages: int = PDF_MAX_PAGES,
+                       timeout: float = PDF_EXTRACT_TIMEOUT) -> str:
+    """Extract PDF text in a worker process, off the event loop"""
+    # at most PDF_WORKERS at once; time spent waiting for a slot isn't timed
+    return await run_in_threadpool(_extract_isolated, file_path, max_pages, timeout)
@@ -1,16 +1,56 @@
 import os
-from groq import Groq
-import json
+import re
+import logging
 from typing import Dict, List
-from dotenv import main
-main.load_dotenv()
+import llm_router
+import llm_json
+from pydantic import BaseModel
+from skills import SkillMatcher, skill_matcher, resume_matcher, soft_skill_matcher
 
 
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+logger = logging.getLogger(__name__)
 
-def read_resume_with_groq(resume_text: str) -> Dict:
+
+# bump whenever the prompt below changes; cached analyses are keyed on it
+RESUME_PROMPT_VERSION = "1"
+# bump when the rule-based extraction changes
+LOCAL_EXTRACTION_VERSION = "4"
+RESUME_ANALYSIS_VERSION = f"{RESUME_PROMPT_VERSION}.{LOCAL_EXTRACTION_VERSION}"
+
+# below this the local result gets an LLM enrichment pass (set to 0 to never call Groq)
+RESUME_LLM_THRESHOLD = float(os.getenv("RESUME_LLM_THRESHOLD", "0.5"))
+
+RESUME_KEYS = ('technical_skills', 'soft_skills', 'experience', 'education', 'projects')
+
+
+class ResumeAnalysis(BaseModel):
+    technical_skills: List[str]
+    soft_skills: List[str]
+    experience: List[str]
+    education: List[str]
+    projects: List[str]
+
+# heading line -> section it opens
+SECTION_HEADINGS = {
+    'experience': r'(?:work |professional |relevant )?experience|employment(?: history)?|work history',
+    'education': r'education|academic background',
+    'projects': r'(?:personal |academic |selected )?projects',
+    'skills': r'(?:technical )?skills|technologies|tech stack|core competencies',
+    'summary': r'summary|profile|objective|about me',
+    'certifications': r'certifications?|licenses',
+}
+_HEADING_RE = re.compile(
+    r'^[ \t]*(?:' + '|'.join(
+        f'(?P<{name}>{pattern})' for name, pattern in SECTION_HEADINGS.items()
+    ) + r')[ \t]*:?[ \t]*$',
+    re.IGNORECASE | re.MULTILINE
+)
+_BULLET_RE = re.compile(r'^[\s\u2022\-\*\u25aa\u25cf\u2013]+')
+
+async def read_resume_with_groq(resume_text: str) -> Dict:
     """Analyze resume text using Groq API"""
-    client = Groq(api_key=GROQ_API_KEY)
+    # long resumes (or PDFs that extracted badly) would blow the prompt budget
+    resume_text = llm_router.fit_text(resume_text, llm_router.input_budget("resume"))
     
     prompt = f"""
     Please analyze this resume text and extract the following information in JSON format:
@@ -37,69 +77,118 @@ def read_resume_with_groq(resume_text: str) -> Dict:
     Make sure all skills are individual strings and not descriptions.
     """
     
+    messages = [{
+        "role": "system",
+        "content": """You are an expert at analyzing resumes and extracting relevant skills and experiences with many
+          years of experience under your belt. Always return valid JSON."""
+    }, {
+        "role": "user",
+        "content": prompt
+    }]
     try:
-        completion = client.chat.completions.create(
-            messages=[{
-                "role": "system",
-                "content": """You are an expert at analyzing resumes and extracting relevant skills and experiences with many
-                  years of experience under your belt. Always return valid JSON."""
-            }, {
-                "role": "user",
-                "content": prompt
-            }],
-            model="mixtral-8x7b-32768",
-            temperature=0.1,
-            max_tokens=2000
-        )
+        response_text = await llm_router.complete("resume", messages=messages, temperature=0.1)
         
-        # JSON
-        response_text = completion.choices[0].message.content.strip()
+        # JSON, with only the broken fields asked for again
         try:
-            return json.loads(response_text)
-        except json.JSONDecodeError as e:
-            print(f"Invalid JSON response: {response_text}")
+            return await llm_json.parse(response_text, ResumeAnalysis, messages)
+        except ValueError as e:
+            logger.error(f"Invalid JSON response: {response_text} ({e})")
             return None
             
     except Exception as e:
-        print(f"Error in Groq resume analysis: {str(e)}")
+        logger.error(f"Error in Groq resume analysis: {e}")
         return None
 
-def extract_skills(resume_analysis: Dict) -> List[str]:
+def extract_skills(resume_analysis: Dict, matcher: SkillMatcher = skill_matcher,
+                   prose_matcher: SkillMatcher = resume_matcher) -> List[str]:
     """Skills"""
     if not resume_analysis:
         return []
     
-    skills = set()
+    # casefolded -> display name, keeps first spelling
+    skills = {}
     
-    # Technical
-    if 'technical_skills' in resume_analysis:
-        skills.update(skill.strip() for skill in resume_analysis['technical_skills'])
+    def add(skill: str):
+        skill = matcher.canonical(skill) or skill.strip()
+        if skill:
+            skills.setdefault(skill.casefold(), skill)
     
-    # Soft
-    if 'soft_skills' in resume_analysis:
-        skills.update(skill.strip() for skill in resume_analysis['soft_skills'])
+    # Technical + Soft
+    for key in ('technical_skills', 'soft_skills'):
+        for skill in resume_analysis.get(key) or []:
+            if isinstance(skill, str):
+                add(skill)
     
-    # Project
-    if 'projects' in resume_analysis:
-        for project in resume_analysis['projects']:
-            if isinstance(project, str):
-                # Issue
-                technical_terms = [word.strip() for word in project.split() 
-                                 if word[0].isupper() or 
-                                 any(tech in word.lower() for tech in [
-                                     'python', 'java', 'sql', 'aws', 'azure', 'javascript',
-                                     'pandas', 'apis', 'react', 'node.js', 'express.js', 'docker', 'kubernetes',
-                                        'html', 'css', 'git', 'github', 'linux', 'unix', 'bash',
-                                        'api', 'rest', 'graphql', 'sqlalchemy', 'flask', 'django',
-                                        'fastapi', 'numpy', 'pandas', 'scipy', 'scikit-learn',
-                                        'tensorflow', 'keras', 'pytorch', 'opencv', 'nltk',
-                                        'R', 'Rust', 'C++', 'C#', 'Java', 'Scala', 'Go', 'Ruby'
-                                 ])]
-                skills.update(technical_terms)
+    # Project descriptions are prose ("rest of the team"), so they get the prose matcher
+    for project in resume_analysis.get('projects') or []:
+        if isinstance(project, str):
+            for skill in prose_matcher.extract(project):
+                add(skill)
     
-    skills.discard('')
+    return list(skills.values())
+
+
+def split_sections(resume_text: str) -> Dict[str, str]:
+    """Split resume text on heading lines; text before the first heading is 'header'"""
+    sections = {}
+    name, start = 'header', 0
+    for m in _HEADING_RE.finditer(resume_text):
+        sections[name] = sections.get(name, '') + resume_text[start:m.start()]
+        name, start = m.lastgroup, m.end()
+    sections[name] = sections.get(name, '') + resume_text[start:]
+    return {k: v.strip() for k, v in sections.items() if v.strip()}
+
+
+def _section_lines(text: str, limit: int = 20) -> List[str]:
+    lines = (_BULLET_RE.sub('', line).strip() for line in text.splitlines())
+    return [line for line in lines if len(line) > 2][:limit]
+
+
+def analyze_resume_locally(resume_text: str, matcher: SkillMatcher = resume_matcher) -> Dict:
+    """Rule-based resume analysis, same keys as read_resume_with_groq plus a confidence"""
+    sections = split_sections(resume_text or '')
+    
+    analysis = {
+        'technical_skills': matcher.extract(resume_text or ''),
+        'soft_skills': soft_skill_matcher.extract(resume_text or ''),
+        'experience': _section_lines(sections.get('experience', '')),
+        'education': _section_lines(sections.get('education', '')),
+        'projects': _section_lines(sections.get('projects', '')),
+    }
+    
+    # structure found + enough skills -> trust it
+    found = sum(1 for key in ('experience', 'education', 'projects', 'skills') if key in sections)
+    analysis['confidence'] = round(
+        0.6 * found / 4 + 0.4 * min(len(analysis['technical_skills']) / 8, 1.0), 2
+    )
+    analysis['source'] = 'local'
+    return analysis
+
+
+def _merge_analyses(local: Dict, enriched: Dict) -> Dict:
+    merged = dict(local)
+    for key in RESUME_KEYS:
+        values = list(local.get(key) or [])
+        seen = {v.casefold() for v in values if isinstance(v, str)}
+        for value in enriched.get(key) or []:
+            if isinstance(value, str) and value.casefold() not in seen:
+                seen.add(value.casefold())
+                values.append(value)
+        merged[key] = values
+    merged['source'] = 'local+llm'
+    return merged
+
+
+async def analyze_resume(resume_text: str, threshold: float = RESUME_LLM_THRESHOLD) -> Dict:
+    """Local extraction first; Groq only enriches low-confidence results"""
+    analysis = analyze_resume_locally(resume_text)
+    if analysis['confidence'] >= threshold:
+        return analysis
     
-    return list(skills)
+    enriched = await read_resume_with_groq(resume_text)
+    if enriched:
+        return _merge_analyses(analysis, enriched)
+    return analysis
 
 
 # resume_text = "Your resume text here"
@@ -0,0 +1,215 @@
+import re
+import difflib
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from skills import skill_matcher
+
+
+# courses for the role's own required skills, added after the career-specific ones
+MAX_SKILL_COURSES = 2
+# difflib ratio a job title needs to borrow a known career's resources
+TITLE_MATCH_CUTOFF = 0.85
+
+COURSES = [
+    {
+        "title": "The Complete Web Development Bootcamp 2024",
+        "platform": "Udemy",
+        "link": "https://www.udemy.com/course/the-complete-web-development-bootcamp/",
+        "price": "$13.99",
+        "rating": 4.8,
+        "skill": "Web Development",
+        "difficulty": "Beginner"
+    },
+    {
+        "title": "React - The Complete Guide",
+        "platform": "Udemy",
+        "link": "https://www.udemy.com/course/react-the-complete-guide/",
+        "price": "$12.99",
+        "rating": 4.7,
+        "skill": "React",
+        "difficulty": "Intermediate"
+    },
+    {
+        "title": "Complete Python Programming Masterclass",
+        "platform": "Udemy",
+        "link": "https://www.udemy.com/course/complete-python-bootcamp/",
+        "price": "$14.99",
+        "rating": 4.8,
+        "skill": "Python",
+        "difficulty": "Beginner"
+    },
+    {
+        "title": "Node.js, Express, MongoDB & More",
+        "platform": "Udemy",
+        "link": "https://www.udemy.com/course/nodejs-express-mongodb-bootcamp/",
+        "price": "$15.99",
+        "rating": 4.7,
+        "skill": "Node.js",
+        "difficulty": "Intermediate"
+    },
+    {
+        "title": "Modern JavaScript from the Beginning",
+        "platform": "Udemy",
+        "link": "https://www.udemy.com/course/modern-javascript/",
+        "price": "$14.99",
+        "rating": 4.7,
+        "skill": "JavaScript",
+        "difficulty": "Beginner"
+    },
+    {
+        "title": "Git Complete: The definitive guide",
+        "platform": "Udemy",
+        "link": "https://www.udemy.com/course/git-complete/",
+        "price": "$12.99",
+        "rating": 4.7,
+        "skill": "Git",
+        "difficulty": "Beginner"
+    },
+    {
+        "title": "Data Structures and Algorithms",
+        "platform": "Coursera",
+        "link": "https://www.coursera.org/learn/algorithms-part1",
+        "price": "$49.99",
+        "rating": 4.8,
+        "skill": "DSA",
+        "difficulty": "Intermediate"
+    },
+]
+
+ADDITIONAL_RESOURCES = [
+    {
+        "title": "MDN Web Docs",
+        "type": "Documentation",
+        "link": "https://developer.mozilla.org",
+        "description": "Comprehensive web development documentation",
+        "format": "Text"
+    },
+    {
+        "title": "Frontend Masters",
+        "type": "Video Courses",
+        "link": "https://frontendmasters.com",
+        "description": "Advanced frontend development courses",
+        "format": "Video"
+    },
+    {
+        "title": "Python Documentation",
+        "type": "Documentation",
+        "link": "https://docs.python.org/3/",
+        "description": "Official Python programming documentation",
+        "format": "Text"
+    },
+    {
+        "title": "Node.js Documentation",
+        "type": "Documentation",
+        "link": "https://nodejs.org/docs/latest/",
+        "description": "Official Node.js documentation",
+        "format": "Text"
+    },
+    {
+        "title": "GitHub Learning Lab",
+        "type": "Interactive Tutorial",
+        "link": "https://lab.github.com",
+        "description": "Learn essential GitHub workflows",
+        "format": "Interactive"
+    },
+    {
+        "title": "LeetCode",
+        "type": "Practice Platform",
+        "link": "https://leetcode.com",
+        "description": "Practice coding problems",
+        "format": "Interactive"
+    },
+]
+
+# career -> (course titles, resource titles, other names the LLM uses for it)
+CAREERS = {
+    "Web Developer": (
+        ["The Complete Web Development Bootcamp 2024", "React - The Complete Guide"],
+        ["MDN Web Docs", "Frontend Masters"],
+        ["Frontend Developer", "Front End Developer", "Front-End Developer", "Web Engineer"]
+    ),
+    "Backend Developer": (
+        ["Complete Python Programming Masterclass", "Node.js, Express, MongoDB & More"],
+        ["Python Documentation", "Node.js Documentation"],
+        ["Back End Developer", "Back-End Developer", "Backend Engineer", "Backend Software Engineer"]
+    ),
+}
+
+# what every recommendation gets after the career-specific resources
+DEFAULT_COURSES = ["Git Complete: The definitive guide", "Data Structures and Algorithms"]
+DEFAULT_RESOURCES = ["GitHub Learning Lab", "LeetCode"]
+
+# seniority and filler words that don't change which resources fit
+_TITLE_NOISE_RE = re.compile(r"\b(?:senior|sr|junior|jr|lead|principal|staff|entry level|i{1,3}|[1-3])\b")
+_NON_WORD_RE = re.compile(r"[^a-z0-9+#]+")
+
+
+def normalize_title(title: str) -> str:
+    """'Sr. Front-End Developer II' -> 'front end developer'"""
+    text = _NON_WORD_RE.sub(" ", (title or "").casefold())
+    return " ".join(_TITLE_NOISE_RE.sub(" ", text).split())
+
+
+class ResourceCatalog:
+    """Courses and resources indexed by career title and canonical skill
+
+    Built once at import, so assembling a recommendation's resources is a
+    few dict lookups; the fuzzy title match is memoized per distinct title.
+    """
+
+    def __init__(self, courses, resources, careers, default_courses, default_resources):
+        by_title = {course["title"]: course for course in courses}
+        resources_by_title = {resource["title"]: resource for resource in resources}
+
+        self.skill_courses: Dict[str, List[dict]] = {}
+        for course in courses:
+            skill = skill_matcher.canonical(course["skill"]) or course["skill"]
+            self.skill_courses.setdefault(skill.casefold(), []).append(course)
+
+        self.default_courses = [by_title[title] for title in default_courses]
+        self.default_resources = [resources_by_title[title] for title in default_resources]
+        self.careers = {}
+        self._titles = {}
+        for career, (course_titles, resource_titles, aliases) in careers.items():
+            self.careers[career] = (
+                [by_title[title] for title in course_titles],
+                [resources_by_title[title] for title in resource_titles] + self.default_resources
+            )
+            for name in [career] + list(aliases):
+                self._titles[normalize_title(name)] = career
+        self.match_career = lru_cache(maxsize=4096)(self._match_career)
+
+    def _match_career(self, title: str) -> Optional[str]:
+        key = normalize_title(title)
+        if key in self._titles:
+            return self._titles[key]
+        close = difflib.get_close_matches(key, list(self._titles), n=1, cutoff=TITLE_MATCH_CUTOFF)
+        return self._titles[close[0]] if close else None
+
+    def courses_for_skill(self, skill: str) -> List[dict]:
+        canonical = skill_matcher.canonical(skill) or (skill or "").strip()
+        return self.skill_courses.get(canonical.casefold(), [])
+
+    def learning_resources(self, job_title: str, required_skills: Iterable[str] = ()) -> dict:
+        """Career-specific courses, then ones for the role's skills, then the defaults"""
+        career = self.match_career(job_title or "")
+        courses, resources = self.careers[career] if career else ([], self.default_resources)
+
+        extra, seen = [], {course["link"] for course in courses + self.default_courses}
+        for skill in required_skills:
+            if len(extra) >= MAX_SKILL_COURSES:
+                break
+            for course in self.courses_for_skill(skill)[:1]:
+                if course["link"] not in seen:
+                    seen.add(course["link"])
+                    extra.append(course)
+        # fresh lists, the catalog's own stay untouched
+        return {"courses": courses + extra + self.default_courses, "additional_resources": list(resources)}
+
+
+catalog = ResourceCatalog(COURSES, ADDITIONAL_RESOURCES, CAREERS, DEFAULT_COURSES, DEFAULT_RESOURCES)
+
+
+def learning_resources(job_title: str, required_skills: Iterable[str] = ()) -> dict:
+    return catalog.learning_resources(job_title, required_skills)
@@ -0,0 +1,42 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key onto one in-flight task
+
+    The first caller for a key starts `fn`; anyone asking for that key
+    before it finishes awaits the same task and gets the same result (or
+    exception). Nothing is kept once the task is done, that's the cache's job.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args) -> Any:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.shared += 1
+        else:
+            self.calls += 1
+            task = asyncio.ensure_future(fn(*args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        # a caller going away (client disconnect) must not cancel it for the others
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # nobody may be left to await it, don't let the error go unretrieved
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Single-flight call for {key} failed: {task.exception()}")
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._inflight), "calls": self.calls, "shared": self.shared}
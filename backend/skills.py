@@ -0,0 +1,233 @@
+import os
+import re
+import csv
+import logging
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+
+# canonical name -> synonyms (matching is case-insensitive unless listed below)
+DEFAULT_VOCABULARY = {
+    "Python": ["python3"],
+    "Java": [],
+    "SQL": [],
+    "AWS": ["amazon web services"],
+    "Azure": ["microsoft azure"],
+    "JavaScript": ["js", "ecmascript"],
+    "TypeScript": [],
+    "Pandas": [],
+    "APIs": ["api"],
+    "REST APIs": ["rest", "rest api", "restful", "restful api", "restful apis"],
+    "React": ["react.js", "reactjs"],
+    "Node.js": ["node", "nodejs"],
+    "Express.js": ["express", "expressjs"],
+    "Docker": [],
+    "Kubernetes": ["k8s"],
+    "HTML": ["html5"],
+    "CSS": ["css3"],
+    "Git": [],
+    "GitHub": [],
+    "Linux": [],
+    "Unix": [],
+    "Bash": ["shell scripting"],
+    "GraphQL": [],
+    "SQLAlchemy": [],
+    "Flask": [],
+    "Django": [],
+    "FastAPI": [],
+    "NumPy": [],
+    "SciPy": [],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "TensorFlow": [],
+    "Keras": [],
+    "PyTorch": ["torch"],
+    "OpenCV": [],
+    "NLTK": [],
+    "Machine Learning": ["ml"],
+    "Deep Learning": ["dl"],
+    "R": [],
+    "Rust": [],
+    "C": [],
+    "C++": ["cpp"],
+    "C#": ["csharp"],
+    "Scala": [],
+    "Go": ["golang"],
+    "Ruby": [],
+}
+
+SOFT_SKILLS_VOCABULARY = {
+    "Communication": ["communicating", "communication skills"],
+    "Leadership": ["leading"],
+    "Teamwork": ["team player", "collaboration", "collaborated", "collaborative"],
+    "Problem Solving": ["problem-solving", "problem solver"],
+    "Time Management": [],
+    "Mentoring": ["mentored", "mentorship"],
+    "Project Management": [],
+    "Public Speaking": ["presentations", "presented"],
+    "Critical Thinking": [],
+    "Adaptability": ["adaptable"],
+}
+
+DATASET_SKILLS_PATH = os.getenv(
+    "DATASET_SKILLS_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Datasets", "data.csv")
+)
+
+logger = logging.getLogger(__name__)
+
+# too ambiguous in prose to match in any case ("go", "r&d", "plan c")
+CASE_SENSITIVE_TERMS = {"R", "Go", "C"}
+
+# fine in a skills list, but ordinary words in resume prose ("the rest of the
+# team", "express concerns", "a node in the graph"): the raw-text matcher only
+# takes them in this exact spelling, or not at all when None
+PROSE_TERMS = {
+    "api": "API",
+    "rest": "REST",
+    "ml": "ML",
+    "dl": "DL",
+    "React": "React",
+    "node": None,
+    "express": None,
+    "torch": None,
+}
+
+# a skill may not be glued to letters/digits, and "C" must not eat "C++"/"C#"
+_LEFT_BOUNDARY = r"(?<!\w)"
+_RIGHT_BOUNDARY = r"(?![\w+#])"
+
+
+class SkillMatch(NamedTuple):
+    skill: str
+    start: int
+    end: int
+
+
+def _trie_regex(terms: Iterable[str]) -> str:
+    """Prefix-factored alternation so the regex engine never retries shared prefixes"""
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node) -> str:
+        end = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            # greedy, so the longest term wins and shorter ones are the fallback
+            body = ("(?:" + body + ")" if len(branches) == 1 else body) + "?"
+        return body
+
+    return build(trie)
+
+
+class SkillMatcher:
+    """Single compiled pass over text for every term in a skill vocabulary"""
+
+    def __init__(self, vocabulary: Dict[str, Iterable[str]],
+                 case_sensitive: Iterable[str] = CASE_SENSITIVE_TERMS):
+        self.vocabulary = {name: list(synonyms) for name, synonyms in vocabulary.items()}
+        self.case_sensitive = set(case_sensitive)
+        self._folded = {}
+        self._exact = {}
+        for name, synonyms in self.vocabulary.items():
+            for term in [name, *synonyms]:
+                term = term.strip()
+                if not term:
+                    continue
+                if term in self.case_sensitive:
+                    self._exact[term] = name
+                else:
+                    self._folded.setdefault(term.casefold(), name)
+
+        branches = []
+        if self._folded:
+            branches.append(f"(?P<folded>{_trie_regex(self._folded)})")
+        if self._exact:
+            branches.append(f"(?P<exact>(?-i:{_trie_regex(self._exact)}))")
+        pattern = _LEFT_BOUNDARY + "(?:" + "|".join(branches) + ")" + _RIGHT_BOUNDARY
+        self._regex = re.compile(pattern, re.IGNORECASE) if branches else None
+
+    def __len__(self):
+        return len(self.vocabulary)
+
+    def find(self, text: str) -> List[SkillMatch]:
+        """All non-overlapping matches with their canonical names and positions"""
+        if not text or self._regex is None:
+            return []
+        matches = []
+        for m in self._regex.finditer(text):
+            if m.lastgroup == "folded":
+                name = self._folded[m.group().casefold()]
+            else:
+                name = self._exact[m.group()]
+            matches.append(SkillMatch(name, m.start(), m.end()))
+        return matches
+
+    def extract(self, text: str) -> List[str]:
+        """Unique canonical skills in order of first appearance"""
+        return list(dict.fromkeys(match.skill for match in self.find(text)))
+
+    def canonical(self, skill: str) -> Optional[str]:
+        """Canonical name when the whole string is a known skill"""
+        skill = (skill or "").strip()
+        return self._exact.get(skill) or self._folded.get(skill.casefold())
+
+    def extend(self, vocabulary: Dict[str, Iterable[str]]) -> "SkillMatcher":
+        """New matcher with extra skills/synonyms merged in"""
+        merged = {name: list(synonyms) for name, synonyms in self.vocabulary.items()}
+        for name, synonyms in vocabulary.items():
+            merged.setdefault(name, []).extend(synonyms)
+        return SkillMatcher(merged, self.case_sensitive)
+
+
+def load_dataset_vocabulary(path: str = DATASET_SKILLS_PATH, max_words: int = 4) -> Dict[str, list]:
+    """Skill names from the comma-separated Skill column of data.csv"""
+    vocabulary = {}
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            if "Skill" not in (reader.fieldnames or []):
+                logger.warning(f"No Skill column in {path}, using built-in vocabulary only")
+                return vocabulary
+            for row in reader:
+                for skill in (row["Skill"] or "").split(","):
+                    skill = skill.strip()
+                    # drop sentences and bare numbers, keep names
+                    if skill and len(skill.split()) <= max_words and not skill.isdigit():
+                        vocabulary.setdefault(skill, [])
+    except OSError as e:
+        logger.warning(f"Could not load skills vocabulary from {path}: {e}")
+    return vocabulary
+
+
+def prose_vocabulary(vocabulary: Dict[str, Iterable[str]],
+                     terms: Dict[str, Optional[str]] = PROSE_TERMS) -> Dict[str, list]:
+    """Vocabulary with the PROSE_TERMS words respelled or dropped"""
+    result = {}
+    for name, synonyms in vocabulary.items():
+        kept = []
+        for term in synonyms:
+            term = terms.get(term, term)
+            if term:
+                kept.append(term)
+        result[name] = kept
+    return result
+
+
+# built once at import
+skill_matcher = SkillMatcher(DEFAULT_VOCABULARY)
+# prose-safe base vocabulary plus every skill named in data.csv, for raw resume text
+resume_matcher = SkillMatcher(
+    prose_vocabulary(DEFAULT_VOCABULARY),
+    CASE_SENSITIVE_TERMS | {term for term in PROSE_TERMS.values() if term}
+).extend(load_dataset_vocabulary())
+soft_skill_matcher = SkillMatcher(SOFT_SKILLS_VOCABULARY, case_sensitive=())
+
+
+def find_skills(text: str) -> List[SkillMatch]:
+    return skill_matcher.find(text)
@@ -4,6 +4,39 @@ import { faCircleInfo } from '@fortawesome/free-solid-svg-icons';
 import './CareerForm.css';
 import { useNavigate } from 'react-router-dom';
 
+// Reads the SSE body of /recommendations/stream: calls onField for each
+// `field` event and resolves with the `done` payload
+const readRecommendationStream = async (response, onField) => {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const message = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      let event = 'message';
+      let data = '';
+      message.split('\n').forEach(line => {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) data += line.slice(5).trim();
+      });
+
+      const payload = data ? JSON.parse(data) : null;
+      if (event === 'field') onField(payload.path, payload.value);
+      else if (event === 'done') return payload;
+      else if (event === 'error') throw new Error(payload?.detail || 'Failed to get recommendations');
+    }
+  }
+  throw new Error('Recommendation stream ended early');
+};
+
 const CareerForm = ({ onRecommendations }) => {
   const [formData, setFormData] = useState({
     email: '',
@@ -14,6 +47,7 @@ const CareerForm = ({ onRecommendations }) => {
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
   const [success, setSuccess] = useState(false);
+  const [partial, setPartial] = useState({});
   const navigate = useNavigate();
 
   // Tooltip content
@@ -47,6 +81,7 @@ const CareerForm = ({ onRecommendations }) => {
     setLoading(true);
     setError('');
     setSuccess(false);
+    setPartial({});
 
     try {
       // Create FormData for the request
@@ -58,8 +93,8 @@ const CareerForm = ({ onRecommendations }) => {
         formDataToSend.append('resume', resume);
       }
 
-      // Make the API request
-      const response = await fetch('http://127.0.0.1:8000/recommendations/', {
+      // Streamed: fields show up as soon as the model has written them
+      const response = await fetch('http://127.0.0.1:8000/recommendations/stream', {
         method: 'POST',
         // headers: {
         //   'ngrok-skip-browser-warning': 'true'
@@ -71,7 +106,9 @@ const CareerForm = ({ onRecommendations }) => {
         throw new Error('Failed to get recommendations');
       }
 
-      const recommendations = await response.json();
+      const recommendations = await readRecommendationStream(response, (path, value) => {
+        setPartial(prevState => ({ ...prevState, [path]: value }));
+      });
       console.log('Received recommendations:', recommendations);
       
       setSuccess(true);
@@ -158,6 +195,22 @@ const CareerForm = ({ onRecommendations }) => {
           />
         </div>
 
+        {loading && partial.job_title && (
+          <div className="partial-results">
+            <h3>{partial.job_title}</h3>
+            {partial.required_skills && (
+              <p>Skills: {partial.required_skills.join(', ')}</p>
+            )}
+            {['immediate', 'short_term', 'long_term'].map(stage => (
+              partial[`learning_roadmap.${stage}`] && (
+                <p key={stage}>
+                  {stage.replace('_', ' ')}: {partial[`learning_roadmap.${stage}`].join(', ')}
+                </p>
+              )
+            ))}
+          </div>
+        )}
+
         {error && <div className="error-message">{error}</div>}
         {success && <div className="success-message">Form submitted successfully!</div>}
 
@@ -0,0 +1,14 @@
+import os
+import sys
+import tempfile
+
+# backend modules import each other by name, and need their databases out of the tree
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+sys.path.insert(0, ROOT)
+
+_tmp = tempfile.mkdtemp(prefix="careerchecker-tests-")
+os.environ.setdefault("DB_PATH", os.path.join(_tmp, "career_advisor.db"))
+os.environ.setdefault("CACHE_DB_PATH", os.path.join(_tmp, "career_cache.db"))
+os.environ.setdefault("UPLOAD_DIR", os.path.join(_tmp, "uploads"))
+os.environ.setdefault("JOB_WORKERS", "0")
@@ -0,0 +1,59 @@
+import itertools
+
+import pandas as pd
+
+from DataWrangle.career_graph import CareerGraph
+
+
+def _graph(edges):
+    rows = [
+        {'SOCCode': a, 'SOCTitle': a.upper(), 'TransitionSOCCode': b,
+         'TransitionSOCTitle': b.upper(), 'TransitionWageChange': w,
+         'TransitionWageDirection': 1 if w > 0 else -1}
+        for a, b, w in edges
+    ]
+    return CareerGraph.from_transitions(pd.DataFrame(rows))
+
+
+def _brute_force(graph, source, target, max_hops):
+    best = None
+    nodes = [n for n in graph.titles if n not in (source, target)]
+    for k in range(max_hops):
+        for middle in itertools.permutations(nodes, k):
+            path = (source, *middle, target)
+            gain = 0.0
+            for a, b in zip(path, path[1:]):
+                edge = graph.edges.get(a, {}).get(b)
+                if edge is None:
+                    break
+                gain += edge.wage_change
+            else:
+                if best is None or gain > best:
+                    best = gain
+    return best
+
+
+def test_best_path_prefers_higher_total_over_direct_edge():
+    graph = _graph([('a', 'd', 1.0), ('a', 'b', 2.0), ('b', 'd', 3.0), ('a', 'c', 0.5), ('c', 'b', 0.1)])
+
+    assert graph.best_path('a', 'd', max_hops=1)['path'] == ['a', 'd']
+    result = graph.best_path('a', 'd', max_hops=3)
+    assert result['path'] == ['a', 'b', 'd']
+    assert result['wage_change'] == 5.0
+    assert result['titles'] == ['A', 'B', 'D']
+
+
+def test_best_path_matches_brute_force_on_a_dense_graph():
+    nodes = 'abcdef'
+    edges = [(x, y, float((i * 7 + j * 3) % 11 - 5))
+             for i, x in enumerate(nodes) for j, y in enumerate(nodes) if x != y]
+    graph = _graph(edges)
+
+    for max_hops in (1, 2, 3):
+        assert graph.best_path('a', 'f', max_hops)['wage_change'] == _brute_force(graph, 'a', 'f', max_hops)
+
+
+def test_best_path_without_a_route():
+    graph = _graph([('a', 'b', 1.0), ('c', 'd', 1.0)])
+    assert graph.best_path('a', 'd') is None
+    assert graph.best_path('a', 'a') is None
@@ -0,0 +1,50 @@
+import time
+
+import pytest
+
+import db
+import job_queue
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = db._connect(str(tmp_path / "jobs.db"))
+    db.migrate(conn)
+    yield conn
+    conn.close()
+
+
+def _expire(conn, job_id):
+    with conn:
+        conn.execute("UPDATE jobs SET lease_until = ? WHERE id = ?", (time.time() - 1, job_id))
+
+
+def test_expired_lease_is_reclaimed_before_max_attempts(conn):
+    job_id = job_queue._enqueue(conn, "resume", {})
+    assert job_queue._claim(conn, "w1")["attempts"] == 1
+    _expire(conn, job_id)
+
+    job = job_queue._claim(conn, "w2")
+
+    assert job["id"] == job_id
+    assert job["attempts"] == 2
+
+
+def test_expired_lease_at_max_attempts_fails_instead_of_reclaiming(conn):
+    job_id = job_queue._enqueue(conn, "resume", {})
+    for attempt in range(job_queue.JOB_MAX_ATTEMPTS):
+        assert job_queue._claim(conn, f"w{attempt}")["id"] == job_id
+        _expire(conn, job_id)
+
+    assert job_queue._claim(conn, "late") is None
+    job = job_queue._get_job(conn, job_id)
+    assert job["status"] == "failed"
+    assert job["attempts"] == job_queue.JOB_MAX_ATTEMPTS
+    assert "Lease expired" in job["error"]
+    assert job["finished_at"] is not None
+
+
+def test_live_lease_is_not_reclaimed(conn):
+    job_queue._enqueue(conn, "resume", {})
+    assert job_queue._claim(conn, "w1") is not None
+    assert job_queue._claim(conn, "w2") is None
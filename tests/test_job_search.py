@@ -0,0 +1,41 @@
+import pandas as pd
+
+import job_search
+from DataWrangle.dtypes import apply_dtype_plan
+
+
+def _jobs(**overrides):
+    df = pd.DataFrame({
+        "Job Title": ["Data Analyst", "Backend Developer", "Data Analyst"],
+        "Company": ["Acme", None, "Initech"],
+        "Location": ["Austin, TX", "Remote", "Denver, CO"],
+        "Experience Level": ["Junior", "Senior", "Mid-Level"],
+        "Required Skills": ["SQL, Python", None, "SQL"],
+        "Salary_Min": [60000.0, 90000.0, None],
+        "Salary_Max": [80000.0, 120000.0, None],
+        "Date Posted": pd.to_datetime(["2024-01-01", "2024-02-01", "2024-03-01"]),
+    })
+    for column, value in overrides.items():
+        df[column] = value
+    return df
+
+
+def test_index_builds_with_null_company_after_dtype_plan():
+    # the plan makes Company categorical, where fillna("") used to raise
+    df = apply_dtype_plan(_jobs(), "jobs")
+    assert isinstance(df["Company"].dtype, pd.CategoricalDtype)
+
+    index = job_search.JobSearchIndex(df)
+
+    jobs = index.search(title="developer")["jobs"]
+    assert [job["title"] for job in jobs] == ["Backend Developer"]
+    assert jobs[0]["company"] is None
+    assert jobs[0]["skills"] == []
+
+
+def test_index_builds_without_company_column():
+    index = job_search.JobSearchIndex(_jobs().drop(columns=["Company"]))
+
+    jobs = index.search(title="analyst", skills=["sql"])["jobs"]
+    assert len(jobs) == 2
+    assert all(job["company"] is None for job in jobs)
@@ -0,0 +1,47 @@
+import asyncio
+from contextlib import aclosing
+from types import SimpleNamespace
+
+import llm_client
+import llm_router
+
+
+class FakeStream:
+    def __init__(self, texts):
+        self.texts = texts
+        self.closed = False
+
+    def __aiter__(self):
+        return self._chunks()
+
+    async def _chunks(self):
+        for text in self.texts:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+    async def close(self):
+        self.closed = True
+
+
+def test_breaking_out_of_a_stream_releases_the_semaphore(monkeypatch):
+    fake = FakeStream(["{", "\"a\"", ": 1}"])
+
+    async def create(**kwargs):
+        return fake
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(llm_client, "get_client", lambda: client)
+    monkeypatch.setattr(llm_client, "_semaphore", None)
+
+    async def consume():
+        messages = [{"role": "user", "content": "hi"}]
+        async with aclosing(llm_router.stream("recommendation", messages)) as pieces:
+            async for piece in pieces:
+                break
+        semaphore = llm_client._get_semaphore()
+        return piece, semaphore._value
+
+    piece, free = asyncio.run(consume())
+
+    assert piece == "{"
+    assert free == llm_client.LLM_MAX_CONCURRENCY
+    assert fake.closed
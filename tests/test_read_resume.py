@@ -0,0 +1,27 @@
+from read_resume import extract_skills
+
+
+def test_project_prose_does_not_yield_false_skills():
+    analysis = {
+        "technical_skills": ["Python"],
+        "soft_skills": [],
+        "projects": [
+            "Built a scheduler with the rest of the team",
+            "Restarted every node in the cluster after an express outage",
+            "Carried the torch on a REST API migration in Python",
+        ],
+    }
+
+    skills = {skill.casefold() for skill in extract_skills(analysis)}
+
+    assert "python" in skills
+    assert "rest apis" in skills  # the uppercase acronym still counts
+    assert not skills & {"node.js", "express.js", "pytorch"}
+
+
+def test_listed_skills_keep_the_full_vocabulary():
+    analysis = {"technical_skills": ["node.js", "express"], "projects": []}
+
+    skills = {skill.casefold() for skill in extract_skills(analysis)}
+
+    assert {"node.js", "express.js"} <= skills
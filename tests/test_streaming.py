@@ -0,0 +1,32 @@
+import pandas as pd
+import pandas.testing as tm
+
+from DataWrangle.streaming import read_chunked
+
+
+def test_read_chunked_matches_read_csv(tmp_path):
+    path = tmp_path / "jobs.csv"
+    pd.DataFrame({
+        "wage": [1.5, 2.5, 3.0, None, 5.0, 6.0, 7.5],
+        # int64 in the first chunks, float64 once a NaN shows up
+        "count": [1, 2, 3, 4, None, 6, 7],
+        "sector": ["a", "b", "a", "c", "c", "d", "a"],
+        "title": ["one", "two\nlines", "three", "four", "five", "six", "seven"],
+    }).to_csv(path, index=False)
+    dtype = {"wage": "float32", "sector": "category"}
+
+    result = read_chunked(path, dtype, chunksize=2)
+
+    expected = pd.read_csv(path, dtype=dtype)
+    expected["sector"] = expected["sector"].cat.set_categories(["a", "b", "c", "d"])
+    tm.assert_frame_equal(result, expected)
+
+
+def test_read_chunked_header_only(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_text("a,b\n")
+
+    result = read_chunked(path, {"a": "float32"})
+
+    assert list(result.columns) == ["a", "b"]
+    assert len(result) == 0